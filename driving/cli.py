@@ -1,12 +1,53 @@
 """Driving CLI Tool - 命令行入口"""
 
+import importlib
+
 import click
 
 from driving import __version__
-from driving.commands import framework, ide, link, repo, skills, update
 
+# 子命令注册表：命令名 -> (模块路径, 函数名)
+# 子命令模块（及其依赖的 GitPython、Rich 等）在命令实际执行时才导入
+_LAZY_COMMANDS = {
+    # Driving 仓库管理命令
+    "pull": ("driving.commands.repo", "pull"),
+    "commit": ("driving.commands.repo", "commit"),
+    "push": ("driving.commands.repo", "push"),
+    # Driving 管理命令
+    "install": ("driving.commands.link", "install"),
+    "uninstall": ("driving.commands.link", "uninstall"),
+    # 框架仓库管理命令
+    "git-list": ("driving.commands.framework", "git_list"),
+    "git-install": ("driving.commands.framework", "git_install"),
+    "git-checkout": ("driving.commands.framework", "git_checkout"),
+    "git-pull": ("driving.commands.framework", "git_pull"),
+    "git-sources": ("driving.commands.framework", "git_sources"),
+    # IDE 配置管理命令
+    "ide-list": ("driving.commands.ide", "ide_list"),
+    "ide-sync": ("driving.commands.ide", "ide_sync"),
+    # Skills 管理命令
+    "skills-sync": ("driving.commands.skills", "skills_sync"),
+    # 更新命令
+    "version": ("driving.commands.update", "version"),
+    "update": ("driving.commands.update", "update"),
+}
+
+
+class LazyGroup(click.Group):
+    """按需加载子命令的命令组"""
+
+    def list_commands(self, ctx):
+        return sorted(_LAZY_COMMANDS)
 
-@click.group()
+    def get_command(self, ctx, cmd_name):
+        target = _LAZY_COMMANDS.get(cmd_name)
+        if target is None:
+            return None
+        module_name, attr_name = target
+        return getattr(importlib.import_module(module_name), attr_name)
+
+
+@click.group(cls=LazyGroup)
 @click.version_option(version=__version__)
 def cli():
     """Driving CLI Tool - 管理开发框架文档和代码仓库
@@ -21,33 +62,5 @@ def cli():
     pass
 
 
-# 注册 Driving 仓库管理命令
-cli.add_command(repo.pull)
-cli.add_command(repo.commit)
-cli.add_command(repo.push)
-
-# 注册 Driving 管理命令
-cli.add_command(link.install)
-cli.add_command(link.uninstall)
-
-# 注册框架仓库管理命令
-cli.add_command(framework.git_list)
-cli.add_command(framework.git_install)
-cli.add_command(framework.git_checkout)
-cli.add_command(framework.git_pull)
-cli.add_command(framework.git_sources)
-
-# 注册 IDE 配置管理命令
-cli.add_command(ide.ide_list)
-cli.add_command(ide.ide_sync)
-
-# 注册 Skills 管理命令
-cli.add_command(skills.skills_sync)
-
-# 注册更新命令
-cli.add_command(update.version)
-cli.add_command(update.update)
-
-
 if __name__ == "__main__":
     cli()
@@ -1,5 +1,6 @@
-"""命令实现模块"""
+"""命令实现模块
 
-from . import framework, ide, link, repo, skills, update
+子模块由 driving.cli 在执行对应命令时按需导入。
+"""
 
 __all__ = ["repo", "link", "framework", "ide", "skills", "update"]
@@ -1,24 +1,118 @@
 """框架仓库管理命令"""
 
 import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import click
-import git
-from rich.console import Console
-from rich.table import Table
 
-from driving.models.framework import get_framework_by_name
 from driving.utils.config import (
     check_environment,
     get_all_gitlist_files,
     get_driving_dir,
     get_framework_base_dir,
-    get_gitlist_file,
     is_local_mode,
 )
-from driving.utils.git_helper import clone_repository, find_git_root, is_local_framework
-from driving.utils.logger import log_error, log_info, log_success
+from driving.utils.git_helper import (
+    clone_repository,
+    find_git_root,
+    get_remote_head,
+    is_local_framework,
+)
+from driving.utils.json_helper import dumps_bytes as json_dumps_bytes
+from driving.utils.json_helper import loads as json_loads
+from driving.utils.logger import (
+    format_info,
+    format_success,
+    log_error,
+    log_info,
+    log_lines,
+    log_success,
+)
+
+# git-install 并发克隆/更新框架仓库的最大线程数
+_INSTALL_MAX_WORKERS = 8
+
+# gitlist.json 解析缓存：{文件路径: (mtime_ns, 文件大小, 框架列表)}
+_gitlist_cache: dict[Path, tuple[int, int, list[dict]]] = {}
+
+
+def _load_gitlist(gitlist_file: Path) -> list[dict]:
+    """读取并解析 gitlist.json，文件未变化时直接返回缓存结果
+
+    通过 mtime_ns 和文件大小判断文件是否变化，同一进程内重复读取不会再次解析。
+
+    Args:
+        gitlist_file: gitlist.json 文件路径
+
+    Returns:
+        list[dict]: 框架配置列表
+
+    Raises:
+        json.JSONDecodeError: 配置文件解析失败
+    """
+    st = os.stat(gitlist_file)
+    cached = _gitlist_cache.get(gitlist_file)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(gitlist_file, "rb") as f:
+        frameworks = json_loads(f.read())
+
+    _gitlist_cache[gitlist_file] = (st.st_mtime_ns, st.st_size, frameworks)
+    return frameworks
+
+
+def _index_frameworks() -> dict[str, tuple[dict, Path]]:
+    """构建框架名称索引
+
+    按 gitlist.json 的优先级顺序建立索引，同名框架以优先级高的文件为准。
+
+    Returns:
+        dict[str, tuple[dict, Path]]: {框架名称: (框架配置, 所在的 gitlist.json 文件路径)}
+    """
+    index = {}
+    for gitlist_file in get_all_gitlist_files():
+        try:
+            frameworks = _load_gitlist(gitlist_file)
+        except json.JSONDecodeError:
+            continue
+        for fw in frameworks:
+            name = fw.get("name", "")
+            # 跳过模板条目
+            if name == "框架名称":
+                continue
+            index.setdefault(name, (fw, gitlist_file))
+    return index
+
+
+def _resolve_with_extends(framework_name: str, by_name: dict[str, tuple[dict, Path]]) -> list[dict]:
+    """获取指定框架及其 extends 中声明的扩展框架
+
+    Args:
+        framework_name: 框架名称（精确匹配）
+        by_name: 由 _index_frameworks() 构建的框架名称索引
+
+    Returns:
+        list[dict]: 主框架在前，扩展框架按 extends 顺序排列；主框架不存在时返回空列表
+    """
+    entry = by_name.get(framework_name)
+    if not entry:
+        return []
+
+    main_framework = entry[0]
+    frameworks = [main_framework]
+
+    # 处理 extends 字段，未找到的扩展框架直接忽略
+    for extend_name in main_framework.get("extends") or []:
+        extend_entry = by_name.get(extend_name)
+        if extend_entry:
+            frameworks.append(extend_entry[0])
+
+    return frameworks
 
 
 def load_all_frameworks() -> list[dict]:
@@ -39,14 +133,12 @@ def load_all_frameworks() -> list[dict]:
     all_frameworks = []
     for gitlist_file in gitlist_files:
         try:
-            with open(gitlist_file, "r", encoding="utf-8") as f:
-                frameworks = json.load(f)
-                # 跳过模板条目
-                frameworks = [fw for fw in frameworks if fw.get("name") != "框架名称"]
-                all_frameworks.extend(frameworks)
+            frameworks = _load_gitlist(gitlist_file)
         except json.JSONDecodeError as e:
             log_error(f"解析配置文件 {gitlist_file} 失败: {e}")
             continue
+        # 跳过模板条目
+        all_frameworks.extend(fw for fw in frameworks if fw.get("name") != "框架名称")
 
     if not all_frameworks:
         log_error("未找到任何框架配置")
@@ -67,22 +159,30 @@ def find_framework_by_name(framework_name: str) -> tuple[dict, Path]:
     Raises:
         click.Abort: 如果未找到框架
     """
-    gitlist_files = get_all_gitlist_files()
-
-    for gitlist_file in gitlist_files:
-        try:
-            with open(gitlist_file, "r", encoding="utf-8") as f:
-                frameworks = json.load(f)
-                for fw in frameworks:
-                    if fw.get("name") == framework_name:
-                        return fw, gitlist_file
-        except json.JSONDecodeError:
-            continue
+    entry = _index_frameworks().get(framework_name)
+    if entry:
+        return entry
 
     log_error(f"未找到框架 '{framework_name}'")
     raise click.Abort()
 
 
+def _write_json(data) -> None:
+    """将 JSON 以 UTF-8 字节直接写入标准输出，省去 print 的文本层编码
+
+    Args:
+        data: 待输出的数据
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(json_dumps_bytes(data).decode("utf-8"))
+        return
+    # 先刷新文本层，避免与此前通过 sys.stdout 输出的内容乱序
+    sys.stdout.flush()
+    buffer.write(json_dumps_bytes(data) + b"\n")
+    buffer.flush()
+
+
 @click.command(name="git-list")
 @click.argument("framework_name", required=False)
 @click.option("--json", "output_json", is_flag=True, help="以 JSON 格式输出")
@@ -112,28 +212,11 @@ def git_list(framework_name: str = None, output_json: bool = False):
 
         # 如果指定了框架名，进行精确匹配并处理 extends
         if framework_name:
-            # 精确匹配框架
-            matched_framework = None
-            for fw in all_frameworks:
-                if fw.get("name", "") == framework_name:
-                    matched_framework = fw
-                    break
-
-            if not matched_framework:
+            # 精确匹配框架，结果包含主框架及其扩展框架
+            frameworks = _resolve_with_extends(framework_name, _index_frameworks())
+            if not frameworks:
                 log_error(f"未找到框架 '{framework_name}'")
                 raise click.Abort()
-
-            # 初始化结果列表，包含主框架
-            frameworks = [matched_framework]
-
-            # 处理 extends 字段
-            if "extends" in matched_framework and matched_framework["extends"]:
-                for extend_name in matched_framework["extends"]:
-                    # 查找扩展框架
-                    for fw in all_frameworks:
-                        if fw.get("name", "") == extend_name:
-                            frameworks.append(fw)
-                            break
         else:
             frameworks = all_frameworks
 
@@ -150,22 +233,18 @@ def git_list(framework_name: str = None, output_json: bool = False):
                     if is_local_framework(fw_copy):
                         # 本地项目：使用当前项目根目录
                         try:
-                            project_root = find_git_root()
-                            full_path_sources = []
-                            for source in fw_copy["sources"]:
-                                full_path = f"{project_root}/{source}"
-                                full_path_sources.append(full_path)
-                            fw_copy["sources"] = full_path_sources
+                            base = str(find_git_root())
+                            fw_copy["sources"] = [
+                                os.path.join(base, source) for source in fw_copy["sources"]
+                            ]
                         except Exception as e:
                             log_error(f"获取本地项目路径失败: {e}")
                     else:
                         # 远程项目：使用 submodules 路径
-                        project_name = fw_copy.get("project_name", "")
-                        full_path_sources = []
-                        for source in fw_copy["sources"]:
-                            full_path = f"{framework_base_dir}/{project_name}/{source}"
-                            full_path_sources.append(full_path)
-                        fw_copy["sources"] = full_path_sources
+                        base = os.path.join(framework_base_dir, fw_copy.get("project_name", ""))
+                        fw_copy["sources"] = [
+                            os.path.join(base, source) for source in fw_copy["sources"]
+                        ]
 
                 processed_frameworks.append(fw_copy)
 
@@ -174,10 +253,13 @@ def git_list(framework_name: str = None, output_json: bool = False):
                 "install_path": str(framework_base_dir),
                 "mode": "local" if local_mode else "standard",
             }
-            print(json.dumps(output_data, ensure_ascii=False, indent=2))
+            _write_json(output_data)
             return
 
         # 使用 Rich 创建表格
+        from rich.console import Console
+        from rich.table import Table
+
         title = f"框架 '{framework_name}' 的仓库列表" if framework_name else "可用框架列表"
         table = Table(title=title)
         table.add_column("框架名称", style="cyan", no_wrap=True)
@@ -217,6 +299,73 @@ def git_list(framework_name: str = None, output_json: bool = False):
         raise click.Abort()
 
 
+def _install_one(
+    framework: dict,
+    framework_base_dir: Path,
+    remote_heads: dict[tuple[str, str], Optional[str]],
+) -> list[str]:
+    """克隆或更新单个框架仓库
+
+    在线程池中执行，日志不直接输出，而是作为格式化后的日志行返回，
+    由调用方按框架顺序统一输出，避免多个框架的日志交错。
+
+    Args:
+        framework: 框架配置字典
+        framework_base_dir: 框架安装目录
+        remote_heads: 远程分支 HEAD 查询缓存，{(url, 分支名): SHA}
+
+    Returns:
+        list[str]: 日志行
+
+    Raises:
+        git.exc.GitCommandError: Git 命令执行失败
+    """
+    import git
+
+    framework_display_name = framework.get("name", "")
+    repo_path = framework_base_dir / framework["project_name"]
+    branch = framework.get("branch")
+    lines = []
+
+    if repo_path.exists():
+        lines.append(format_info("仓库已存在，正在更新..."))
+        repo = git.Repo(repo_path)
+
+        # 如果配置了分支，先切换到指定分支
+        if branch:
+            try:
+                repo.git.checkout(branch)
+                lines.append(format_info(f"已切换到分支: {branch}"))
+            except git.exc.GitCommandError:
+                lines.append(format_info(f"分支 {branch} 不存在，保持当前分支"))
+
+        # 远程分支 HEAD 与本地一致时无需拉取
+        remote_sha = None
+        if not repo.head.is_detached:
+            key = (framework["url"], repo.active_branch.name)
+            if key not in remote_heads:
+                remote_heads[key] = get_remote_head(repo, repo.active_branch.name)
+            remote_sha = remote_heads[key]
+
+        if remote_sha and remote_sha == repo.head.commit.hexsha:
+            lines.append(format_success(f"✓ {framework_display_name} 已是最新，跳过更新"))
+        else:
+            repo.remotes.origin.pull()
+            lines.append(format_success(f"✓ {framework_display_name} 更新成功！"))
+    else:
+        if branch:
+            lines.append(format_info(f"正在克隆仓库到 {repo_path} (分支: {branch})..."))
+        else:
+            lines.append(format_info(f"正在克隆仓库到 {repo_path}..."))
+        clone_repository(framework["url"], repo_path, branch)
+        lines.append(format_success(f"✓ {framework_display_name} 安装成功！"))
+
+    lines.append(format_info(f"框架路径: {repo_path}"))
+    if branch:
+        lines.append(format_info(f"分支: {branch}"))
+    return lines
+
+
 @click.command(name="git-install")
 @click.argument("framework_name")
 def git_install(framework_name: str):
@@ -231,6 +380,8 @@ def git_install(framework_name: str):
     Args:
         framework_name: 框架名称
     """
+    import git
+
     try:
         # 检查环境配置
         is_valid, error_msg = check_environment()
@@ -239,7 +390,6 @@ def git_install(framework_name: str):
             raise click.Abort()
 
         driving_dir = get_driving_dir()
-        gitlist_file = get_gitlist_file()
         framework_base_dir = get_framework_base_dir()
         local_mode = is_local_mode()
 
@@ -249,82 +399,56 @@ def git_install(framework_name: str):
             raise click.Abort()
 
         # 加载所有框架配置
-        all_frameworks = load_all_frameworks()
-
-        # 精确匹配主框架
-        main_framework = None
-        for fw in all_frameworks:
-            if fw.get("name", "") == framework_name:
-                main_framework = fw
-                break
+        load_all_frameworks()
 
-        if not main_framework:
+        # 收集所有需要安装的框架（包括主框架和扩展框架）
+        frameworks_to_install = _resolve_with_extends(framework_name, _index_frameworks())
+        if not frameworks_to_install:
             log_error(f"框架 '{framework_name}' 不存在，请使用 'driving git-list' 查看可用框架")
             raise click.Abort()
+        main_framework = frameworks_to_install[0]
 
-        # 收集所有需要安装的框架（包括主框架和扩展框架）
-        frameworks_to_install = [main_framework]
-
-        # 处理 extends 字段
-        if "extends" in main_framework and main_framework["extends"]:
+        if main_framework.get("extends"):
             log_info(f"检测到扩展框架: {', '.join(main_framework['extends'])}")
-            for extend_name in main_framework["extends"]:
-                # 查找扩展框架
-                for fw in all_frameworks:
-                    if fw.get("name", "") == extend_name:
-                        frameworks_to_install.append(fw)
-                        break
 
         # 确保 submodules 目录存在
         framework_base_dir.mkdir(parents=True, exist_ok=True)
 
-        # 逐个安装框架
+        # 远程分支 HEAD 查询结果：{(url, 分支名): SHA}，同一上游仓库只查询一次
+        # 多个线程可能同时查询同一上游，此时只是重复查询一次，不影响结果
+        remote_heads: dict[tuple[str, str], Optional[str]] = {}
+
+        # 本地项目无需安装，其余框架并发克隆/更新，结果按框架顺序输出
+        todo = [fw for fw in frameworks_to_install if not is_local_framework(fw)]
         installed_count = 0
         skipped_count = 0
-        for framework in frameworks_to_install:
-            framework_display_name = framework.get("name", "")
-
-            log_info(f"\n{'='*50}")
-            log_info(f"正在处理框架: {framework_display_name}")
-            log_info(f"{'='*50}")
-
-            # 检查是否为本地项目
-            if is_local_framework(framework):
-                log_info(f"检测到本地项目配置，跳过安装")
-                log_info(f"源码路径: {', '.join(framework.get('sources', []))}")
-                skipped_count += 1
-                continue
-
-            repo_path = framework_base_dir / framework["project_name"]
-            branch = framework.get("branch")
-
-            if repo_path.exists():
-                log_info(f"仓库已存在，正在更新...")
-                repo = git.Repo(repo_path)
-
-                # 如果配置了分支，先切换到指定分支
-                if branch:
-                    try:
-                        repo.git.checkout(branch)
-                        log_info(f"已切换到分支: {branch}")
-                    except git.exc.GitCommandError:
-                        log_info(f"分支 {branch} 不存在，保持当前分支")
-
-                repo.remotes.origin.pull()
-                log_success(f"✓ {framework_display_name} 更新成功！")
-            else:
-                if branch:
-                    log_info(f"正在克隆仓库到 {repo_path} (分支: {branch})...")
-                else:
-                    log_info(f"正在克隆仓库到 {repo_path}...")
-                clone_repository(framework["url"], repo_path, branch)
-                log_success(f"✓ {framework_display_name} 安装成功！")
-
-            log_info(f"框架路径: {repo_path}")
-            if branch:
-                log_info(f"分支: {branch}")
+        with ThreadPoolExecutor(max_workers=min(_INSTALL_MAX_WORKERS, len(todo) or 1)) as executor:
+            futures = {
+                id(fw): executor.submit(_install_one, fw, framework_base_dir, remote_heads)
+                for fw in todo
+            }
 
-            installed_count += 1
+            for framework in frameworks_to_install:
+                header = [
+                    format_info(f"\n{'='*50}"),
+                    format_info(f"正在处理框架: {framework.get('name', '')}"),
+                    format_info(f"{'='*50}"),
+                ]
+
+                future = futures.get(id(framework))
+                if future is None:
+                    log_lines(
+                        [
+                            *header,
+                            format_info("检测到本地项目配置，跳过安装"),
+                            format_info(f"源码路径: {', '.join(framework.get('sources', []))}"),
+                        ]
+                    )
+                    skipped_count += 1
+                    continue
+
+                log_lines(header + future.result())
+                installed_count += 1
 
         # 显示总结信息
         log_info(f"\n{'='*50}")
@@ -357,6 +481,8 @@ def git_checkout(framework_name: str, branch_name: str):
         framework_name: 框架名称
         branch_name: 分支名称
     """
+    import git
+
     try:
         # 检查环境配置
         is_valid, error_msg = check_environment()
@@ -365,7 +491,6 @@ def git_checkout(framework_name: str, branch_name: str):
             raise click.Abort()
 
         driving_dir = get_driving_dir()
-        gitlist_file = get_gitlist_file()
         framework_base_dir = get_framework_base_dir()
         local_mode = is_local_mode()
 
@@ -374,10 +499,11 @@ def git_checkout(framework_name: str, branch_name: str):
             log_error("请先执行 'driving install' 命令添加 driving submodule")
             raise click.Abort()
 
-        framework = get_framework_by_name(gitlist_file, framework_name)
-        if not framework:
+        entry = _index_frameworks().get(framework_name)
+        if not entry:
             log_error(f"框架 '{framework_name}' 不存在，请使用 'driving git-list' 查看可用框架")
             raise click.Abort()
+        framework = entry[0]
 
         repo_path = framework_base_dir / framework["project_name"]
         if not repo_path.exists():
@@ -408,6 +534,8 @@ def git_pull(framework_name: str):
     Args:
         framework_name: 框架名称
     """
+    import git
+
     try:
         # 检查环境配置
         is_valid, error_msg = check_environment()
@@ -416,7 +544,6 @@ def git_pull(framework_name: str):
             raise click.Abort()
 
         driving_dir = get_driving_dir()
-        gitlist_file = get_gitlist_file()
         framework_base_dir = get_framework_base_dir()
         local_mode = is_local_mode()
 
@@ -425,10 +552,11 @@ def git_pull(framework_name: str):
             log_error("请先执行 'driving install' 命令添加 driving submodule")
             raise click.Abort()
 
-        framework = get_framework_by_name(gitlist_file, framework_name)
-        if not framework:
+        entry = _index_frameworks().get(framework_name)
+        if not entry:
             log_error(f"框架 '{framework_name}' 不存在，请使用 'driving git-list' 查看可用框架")
             raise click.Abort()
+        framework = entry[0]
 
         repo_path = framework_base_dir / framework["project_name"]
         if not repo_path.exists():
@@ -472,86 +600,49 @@ def git_sources(framework_name: str):
             log_error(error_msg)
             raise click.Abort()
 
-        gitlist_file = get_gitlist_file()
-        local_mode = is_local_mode()
-
         # 加载所有框架配置
-        all_frameworks = load_all_frameworks()
-
-        # 精确匹配框架
-        matched_framework = None
-        for fw in all_frameworks:
-            if fw.get("name", "") == framework_name:
-                matched_framework = fw
-                break
+        load_all_frameworks()
 
-        if not matched_framework:
+        # 精确匹配框架，结果包含主框架及其扩展框架
+        matched_frameworks = _resolve_with_extends(framework_name, _index_frameworks())
+        if not matched_frameworks:
             log_error(f"未找到框架 '{framework_name}'")
             raise click.Abort()
 
-        # 初始化结果列表，包含主框架
-        matched_frameworks = [matched_framework]
-
-        # 处理 extends 字段
-        if "extends" in matched_framework and matched_framework["extends"]:
-            for extend_name in matched_framework["extends"]:
-                # 查找扩展框架
-                for fw in all_frameworks:
-                    if fw.get("name", "") == extend_name:
-                        matched_frameworks.append(fw)
-                        break
-
         framework_base_dir = get_framework_base_dir()
 
         # 处理 sources 字段，拼接完整路径
+        # 只为有 sources 的框架构建新字典，其余沿用原字典（不修改缓存中的数据）
         processed_frameworks = []
         for fw in matched_frameworks:
-            fw_copy = fw.copy()
-            if "sources" in fw_copy and fw_copy["sources"]:
+            if fw.get("sources"):
                 # 检查是否为本地项目
-                if is_local_framework(fw_copy):
+                if is_local_framework(fw):
                     # 本地项目：使用当前项目根目录
                     try:
-                        project_root = find_git_root()
-                        full_path_sources = []
-                        for source in fw_copy["sources"]:
-                            full_path = f"{project_root}/{source}"
-                            full_path_sources.append(full_path)
-                        fw_copy["sources"] = full_path_sources
+                        base = str(find_git_root())
                     except Exception as e:
                         log_error(f"获取本地项目路径失败: {e}")
                         raise click.Abort()
                 else:
                     # 远程项目：使用 submodules 路径
-                    project_name = fw_copy.get("project_name", "")
-                    full_path_sources = []
-                    for source in fw_copy["sources"]:
-                        full_path = f"{framework_base_dir}/{project_name}/{source}"
-                        full_path_sources.append(full_path)
-                    fw_copy["sources"] = full_path_sources
+                    base = os.path.join(framework_base_dir, fw.get("project_name", ""))
+                fw = {**fw, "sources": [os.path.join(base, source) for source in fw["sources"]]}
 
-            processed_frameworks.append(fw_copy)
+            processed_frameworks.append(fw)
 
         # 如果有多个框架（包含 extends），合并所有 sources 到第一个
         if len(processed_frameworks) > 1:
             first_framework = processed_frameworks[0]
-            all_sources = first_framework.get("sources", [])
+            all_sources = list(first_framework.get("sources", []))
 
             # 合并其他框架的 sources
             for fw in processed_frameworks[1:]:
-                if "sources" in fw and fw["sources"]:
+                if fw.get("sources"):
                     all_sources.extend(fw["sources"])
 
             # 去重并保持顺序
-            seen = set()
-            unique_sources = []
-            for source in all_sources:
-                if source not in seen:
-                    seen.add(source)
-                    unique_sources.append(source)
-
-            first_framework["sources"] = unique_sources
-            result = first_framework
+            result = {**first_framework, "sources": list(dict.fromkeys(all_sources))}
         else:
             result = processed_frameworks[0]
 
@@ -570,7 +661,7 @@ def git_sources(framework_name: str):
         filtered_result = {k: v for k, v in result.items() if k in core_fields}
 
         # 输出 JSON 格式
-        print(json.dumps(filtered_result, ensure_ascii=False, indent=2))
+        _write_json(filtered_result)
 
     except json.JSONDecodeError as e:
         log_error(f"解析配置文件失败: {e}")
@@ -1,18 +1,30 @@
 """IDE 配置管理命令"""
 
-import json
+import mmap
+import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Set, Tuple
+from typing import Any, Dict, Iterator, Set, Tuple, Union
 
 import click
-import git
 
-from driving.utils.config import SENSITIVE_KEYWORDS, get_driving_dir
+from driving.utils.config import SENSITIVE_KEYWORDS_RE, get_driving_dir
 from driving.utils.git_helper import find_git_root
+from driving.utils.json_helper import dumps_bytes as json_dumps_bytes
+from driving.utils.json_helper import loads as json_loads
 from driving.utils.logger import log_error, log_info, log_success, log_warning
 
+# JSON 注释（// 行注释和 /* */ 块注释）
+_JSON_COMMENT_RE = re.compile(rb"//[^\n]*\n|/\*.*?\*/", re.DOTALL)
+
+# 环境变量名中的非法字符
+_ENV_KEY_SANITIZE = re.compile(r"[^A-Z0-9_]")
+
+# 同步 IDE 配置文件时的最大并行线程数
+_SYNC_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 def _is_sensitive_key(key: str) -> bool:
     """判断键名是否为敏感字段
@@ -23,57 +35,67 @@ def _is_sensitive_key(key: str) -> bool:
     Returns:
         bool: 是否为敏感字段
     """
-    key_lower = key.lower()
-    return any(keyword in key_lower for keyword in SENSITIVE_KEYWORDS)
+    return SENSITIVE_KEYWORDS_RE.search(key) is not None
 
 
-def _extract_env_vars(
-    data: Any, prefix: str = "", env_vars: Dict[str, str] = None
-) -> Tuple[Any, Dict[str, str]]:
-    """递归提取敏感环境变量
+def _container_shell(data: Any) -> Tuple[Any, Iterator[Tuple[Any, Any]], bool]:
+    """为 dict/list 创建同尺寸的空容器
 
     Args:
-        data: JSON 数据
-        prefix: 环境变量前缀（不使用，保留参数以保持兼容性）
-        env_vars: 已提取的环境变量字典
+        data: dict 或 list
 
     Returns:
-        Tuple[Any, Dict[str, str]]: (处理后的数据, 环境变量字典)
+        Tuple: (空容器, (键/下标, 值) 迭代器, 是否为 dict)
     """
-    if env_vars is None:
-        env_vars = {}
-
     if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            # 检查是否为敏感字段
-            if isinstance(value, str) and _is_sensitive_key(key) and value:
+        return dict.fromkeys(data), iter(data.items()), True
+    return [None] * len(data), enumerate(data), False
+
+
+def _extract_env_vars(data: Any, env_vars: Dict[str, str]) -> Any:
+    """提取敏感环境变量
+
+    按深度优先顺序遍历 JSON 数据（使用显式栈而非递归），将敏感字段的值写入 env_vars，
+    并在返回的数据中替换为环境变量引用。
+
+    Args:
+        data: JSON 数据（不会被修改）
+        env_vars: 环境变量字典，提取结果直接写入该字典
+
+    Returns:
+        Any: 处理后的数据
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+
+    result, items, is_dict = _container_shell(data)
+    stack = [(items, result, is_dict)]
+
+    while stack:
+        items, target, is_dict = stack[-1]
+        for key, value in items:
+            # 检查是否为敏感字段（仅 dict 的字符串值）
+            if is_dict and isinstance(value, str) and value and _is_sensitive_key(key):
                 # 使用原始的 key 名称（转大写，替换特殊字符为下划线）
-                env_key = key.upper()
-                env_key = re.sub(r"[^A-Z0-9_]", "_", env_key)
+                env_key = _ENV_KEY_SANITIZE.sub("_", key.upper())
 
                 # 存储环境变量
                 env_vars[env_key] = value
 
                 # 替换为环境变量引用
-                result[key] = f"${{{env_key}}}"
+                target[key] = f"${{{env_key}}}"
             elif isinstance(value, (dict, list)):
-                # 递归处理嵌套结构（不传递 prefix）
-                result[key], env_vars = _extract_env_vars(value, "", env_vars)
-            else:
-                result[key] = value
-        return result, env_vars
-    elif isinstance(data, list):
-        result = []
-        for i, item in enumerate(data):
-            if isinstance(item, (dict, list)):
-                new_item, env_vars = _extract_env_vars(item, "", env_vars)
-                result.append(new_item)
+                # 嵌套结构：先处理子节点，处理完后从当前位置继续
+                child, child_items, child_is_dict = _container_shell(value)
+                target[key] = child
+                stack.append((child_items, child, child_is_dict))
+                break
             else:
-                result.append(item)
-        return result, env_vars
-    else:
-        return data, env_vars
+                target[key] = value
+        else:
+            stack.pop()
+
+    return result
 
 
 def _process_mcp_json(file_path: Path, target_dir: Path) -> Set[str]:
@@ -87,46 +109,46 @@ def _process_mcp_json(file_path: Path, target_dir: Path) -> Set[str]:
         Set[str]: 提取的环境变量名集合
     """
     try:
-        # 读取 mcp.json
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        # 读取 mcp.json（内存映射，直接以 bytes 处理，避免额外解码为 str）
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
             # 移除 JSON 注释
-            content = re.sub(r"//.*?\n|/\*.*?\*/", "", content, flags=re.DOTALL)
-            data = json.loads(content)
+            content = _JSON_COMMENT_RE.sub(b"", mm)
+        data = json_loads(content)
 
         # 提取环境变量
-        processed_data, env_vars = _extract_env_vars(data)
+        env_vars = {}
+        processed_data = _extract_env_vars(data, env_vars)
 
         if not env_vars:
             return set()
 
         # 写回处理后的 mcp.json
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(processed_data, f, indent=2, ensure_ascii=False)
+        with open(file_path, "wb") as f:
+            f.write(json_dumps_bytes(processed_data))
 
         # 更新 .env.local 文件（敏感信息）
         env_local_file = target_dir / ".env.local"
         existing_env = {}
 
         if env_local_file.exists():
-            # 读取现有的 .env.local 文件
-            with open(env_local_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        key, value = line.split("=", 1)
-                        existing_env[key.strip()] = value.strip()
+            # 读取现有的 .env.local 文件（跳过空行、注释和不含 = 的行）
+            lines = env_local_file.read_text(encoding="utf-8").splitlines()
+            existing_env = {
+                key.strip(): value.strip()
+                for key, sep, value in (line.strip().partition("=") for line in lines)
+                if sep and not key.startswith("#")
+            }
 
         # 合并新的环境变量
         existing_env.update(env_vars)
 
-        # 写入 .env.local 文件
-        with open(env_local_file, "w", encoding="utf-8") as f:
-            f.write("# IDE 配置环境变量（敏感信息）\n")
-            f.write("# 此文件包含敏感信息，请勿提交到 Git 仓库\n")
-            f.write("# 优先级：.env.local > .env\n\n")
-            for key, value in sorted(existing_env.items()):
-                f.write(f"{key}={value}\n")
+        # 写入 .env.local 文件（拼接完整内容后一次写入）
+        env_local_content = (
+            "# IDE 配置环境变量（敏感信息）\n"
+            "# 此文件包含敏感信息，请勿提交到 Git 仓库\n"
+            "# 优先级：.env.local > .env\n\n"
+        ) + "".join(f"{key}={value}\n" for key, value in sorted(existing_env.items()))
+        env_local_file.write_text(env_local_content, encoding="utf-8")
 
         # 更新 .gitignore
         gitignore_file = target_dir / ".gitignore"
@@ -135,8 +157,9 @@ def _process_mcp_json(file_path: Path, target_dir: Path) -> Set[str]:
         if gitignore_file.exists():
             gitignore_content = gitignore_file.read_text(encoding="utf-8")
 
-        # 确保 .env.local 在 .gitignore 中
-        if ".env.local" not in gitignore_content:
+        # 确保 .env.local 在 .gitignore 中（按行精确匹配，避免误匹配 .env.local.bak 等条目）
+        gitignore_lines = {line.strip() for line in gitignore_content.splitlines()}
+        if not gitignore_lines & {".env.local", "/.env.local"}:
             # 添加 .env.local 到 .gitignore
             if gitignore_content and not gitignore_content.endswith("\n"):
                 gitignore_content += "\n"
@@ -151,59 +174,144 @@ def _process_mcp_json(file_path: Path, target_dir: Path) -> Set[str]:
         return set()
 
 
+def _iter_scandir(root: Union[str, Path], prefix: str = "") -> Iterator[Tuple[os.DirEntry, str]]:
+    """递归遍历目录下的所有文件（与 rglob 一致，不进入符号链接目录）
+
+    Args:
+        root: 遍历的目录
+        prefix: 相对路径前缀（递归时使用）
+
+    Yields:
+        Tuple[os.DirEntry, str]: (文件条目, 相对于起始目录的路径)
+    """
+    with os.scandir(root) as it:
+        entries = list(it)
+
+    for entry in entries:
+        relative_path = os.path.join(prefix, entry.name) if prefix else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_scandir(entry.path, relative_path)
+        elif entry.is_file():
+            yield entry, relative_path
+
+
+def _files_equal(a: Path, b: Path, bufsize: int = 65536) -> bool:
+    """分块比较两个文件的内容，遇到第一个不同的块即返回
+
+    Args:
+        a: 文件路径
+        b: 文件路径
+        bufsize: 每次读取的字节数
+
+    Returns:
+        bool: 内容是否相同
+    """
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            chunk_a = fa.read(bufsize)
+            chunk_b = fb.read(bufsize)
+            if chunk_a != chunk_b:
+                return False
+            if not chunk_a:
+                return True
+
+
+def _copy_file(source_path: Path, target_path: Path) -> None:
+    """复制文件内容及元数据（权限、修改时间）
+
+    shutil.copyfile 会使用平台的零拷贝实现（Linux 的 sendfile/copy_file_range，
+    macOS 的 fcopyfile），再通过 copystat 同步元数据。
+
+    Args:
+        source_path: 源文件路径
+        target_path: 目标文件路径
+    """
+    shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+
+
+def _sync_file(source_entry: os.DirEntry, target_path: Path) -> str:
+    """同步单个文件到目标位置
+
+    Args:
+        source_entry: 源文件条目（复用其缓存的 stat 信息）
+        target_path: 目标文件路径
+
+    Returns:
+        str: 同步结果，"added"（新增）、"updated"（更新）或 "skipped"（内容相同，跳过）
+    """
+    source_path = Path(source_entry.path)
+
+    # 确保目标文件的父目录存在
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 检查文件是否存在
+    try:
+        target_stat = target_path.stat()
+    except FileNotFoundError:
+        # 文件不存在，新增
+        _copy_file(source_path, target_path)
+        return "added"
+
+    # 先比较元数据：大小不同则内容必然不同；大小和修改时间都相同（复制时会保留修改时间）
+    # 则视为内容相同，无需读取文件
+    source_stat = source_entry.stat()
+    if source_stat.st_size == target_stat.st_size:
+        if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+            return "skipped"
+        # 大小相同但修改时间不同，比较文件内容
+        if _files_equal(source_path, target_path):
+            return "skipped"
+
+    # 文件内容不同，覆盖
+    _copy_file(source_path, target_path)
+    return "updated"
+
+
 def _copy_directory_incremental(
     source_dir: Path, target_dir: Path, project_root: Path
-) -> tuple[int, int, int, Set[str]]:
+) -> tuple[int, int, int, Set[str], Set[str]]:
     """增量复制目录，只覆盖同名文件，保留目标目录中的其他文件
 
+    文件比较和复制在线程池中并行执行，mcp.json 的敏感信息处理仍在主线程中按遍历顺序进行。
+
     Args:
         source_dir: 源目录
         target_dir: 目标目录
         project_root: 项目根目录
 
     Returns:
-        tuple[int, int, int, Set[str]]: (新增文件数, 更新文件数, 跳过文件数, 提取的环境变量集合)
+        tuple[int, int, int, Set[str], Set[str]]:
+            (新增文件数, 更新文件数, 跳过文件数, 提取的环境变量集合, 已同步文件的相对路径集合)
     """
-    added_count = 0
-    updated_count = 0
-    skipped_count = 0
+    counts = {"added": 0, "updated": 0, "skipped": 0}
     all_env_vars = set()
 
     # 确保目标目录存在
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    # 遍历源目录
-    for source_path in source_dir.rglob("*"):
-        if source_path.is_file():
-            # 计算相对路径
-            relative_path = source_path.relative_to(source_dir)
-            target_path = target_dir / relative_path
-
-            # 确保目标文件的父目录存在
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # 检查文件是否存在
-            if target_path.exists():
-                # 比较文件内容是否相同
-                if source_path.read_bytes() == target_path.read_bytes():
-                    skipped_count += 1
-                else:
-                    # 文件内容不同，覆盖
-                    shutil.copy2(source_path, target_path)
-                    updated_count += 1
-            else:
-                # 文件不存在，新增
-                shutil.copy2(source_path, target_path)
-                added_count += 1
+    # 遍历源目录，收集需要同步的文件：(源文件条目, 目标文件, 相对路径)
+    files = [
+        (entry, target_dir / relative_path, relative_path)
+        for entry, relative_path in _iter_scandir(source_dir)
+    ]
 
-            # 如果是 mcp.json 文件，处理敏感信息
-            if target_path.name == "mcp.json":
-                env_vars = _process_mcp_json(target_path, project_root)
-                if env_vars:
-                    all_env_vars.update(env_vars)
-                    log_info(f"已从 {relative_path} 提取 {len(env_vars)} 个环境变量到 .env")
+    # 并行同步文件（I/O 密集型，结果顺序与 files 一致）
+    with ThreadPoolExecutor(max_workers=_SYNC_MAX_WORKERS) as executor:
+        results = list(executor.map(lambda item: _sync_file(item[0], item[1]), files))
 
-    return added_count, updated_count, skipped_count, all_env_vars
+    for (_, target_path, relative_path), status in zip(files, results):
+        counts[status] += 1
+
+        # 如果是 mcp.json 文件，处理敏感信息
+        if target_path.name == "mcp.json":
+            env_vars = _process_mcp_json(target_path, project_root)
+            if env_vars:
+                all_env_vars.update(env_vars)
+                log_info(f"已从 {relative_path} 提取 {len(env_vars)} 个环境变量到 .env")
+
+    synced_files = {relative_path for _, _, relative_path in files}
+    return counts["added"], counts["updated"], counts["skipped"], all_env_vars, synced_files
 
 
 @click.command(name="ide-list")
@@ -246,7 +354,12 @@ def ide_list():
 
 @click.command(name="ide-sync")
 @click.argument("ide_name")
-def ide_sync(ide_name: str):
+@click.option(
+    "--report-extras/--no-report-extras",
+    default=False,
+    help="统计目标目录中保留的自定义文件数量（需额外遍历目标目录）",
+)
+def ide_sync(ide_name: str, report_extras: bool = False):
     """同步 IDE 配置到当前工作目录
 
     将 install 目录下对应的 IDE 配置增量同步到当前工作目录。
@@ -255,10 +368,14 @@ def ide_sync(ide_name: str):
 
     Args:
         ide_name: IDE 名称（如 kiro、claude、cursor）
+        report_extras: 是否统计目标目录中保留的自定义文件
 
     示例:
         driving ide-sync kiro  # 将 install/.kiro 增量同步到当前工作目录/.kiro
+        driving ide-sync kiro --report-extras  # 同时统计保留的自定义文件
     """
+    import git
+
     try:
         # 查找项目根目录
         try:
@@ -291,8 +408,8 @@ def ide_sync(ide_name: str):
         log_info(f"源目录: {source_dir}")
         log_info(f"目标目录: {target_dir}")
 
-        added_count, updated_count, skipped_count, env_vars = _copy_directory_incremental(
-            source_dir, target_dir, Path.cwd()
+        added_count, updated_count, skipped_count, env_vars, synced_files = (
+            _copy_directory_incremental(source_dir, target_dir, Path.cwd())
         )
 
         log_success(f"IDE 配置同步成功！")
@@ -304,15 +421,10 @@ def ide_sync(ide_name: str):
             log_warning("请检查 .env.local 文件并填写正确的值")
             log_info("提示：.env.local 包含敏感信息，已自动添加到 .gitignore")
 
-        if target_dir.exists():
-            # 统计目标目录中的其他文件
-            target_files = set(
-                p.relative_to(target_dir) for p in target_dir.rglob("*") if p.is_file()
-            )
-            source_files = set(
-                p.relative_to(source_dir) for p in source_dir.rglob("*") if p.is_file()
-            )
-            extra_files = target_files - source_files
+        if report_extras and target_dir.exists():
+            # 统计目标目录中的其他文件（源目录文件列表复用同步时的遍历结果）
+            target_files = {relative_path for _, relative_path in _iter_scandir(target_dir)}
+            extra_files = target_files - synced_files
 
             if extra_files:
                 log_info(f"保留的自定义文件: {len(extra_files)} 个")
@@ -1,15 +1,94 @@
 """Git Submodule 管理命令"""
 
 import os
+import re
+import shutil
+import stat
+import subprocess
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-import git
 
 from driving.utils.config import DRIVING_REPO_URL, is_local_mode, update_env_file
-from driving.utils.git_helper import find_git_root
+from driving.utils.git_helper import find_git_root, git_error_message, run_git
 from driving.utils.logger import log_error, log_info, log_success, log_warning
 
+if TYPE_CHECKING:
+    import git
+
+# git.Repo 对象缓存：{Git 仓库根目录: 仓库对象}，同一进程内复用，避免重复解析配置
+_repo_cache: dict[Path, "git.Repo"] = {}
+
+
+def _get_repo(git_root: Path) -> "git.Repo":
+    """获取 Git 仓库对象，同一仓库只构建一次
+
+    Args:
+        git_root: Git 仓库根目录
+
+    Returns:
+        git.Repo: 仓库对象
+    """
+    import git
+
+    repo = _repo_cache.get(git_root)
+    if repo is None:
+        repo = _repo_cache[git_root] = git.Repo(git_root)
+    return repo
+
+
+# .driving 目录中不算作必要内容的条目
+_NON_ESSENTIAL_NAMES = frozenset({".git", ".DS_Store", "submodules", ".gitignore"})
+
+# .gitmodules 中的 submodule 段落头，如 [submodule ".driving"]
+_SUBMODULE_HEADER_RE = re.compile(r'\[submodule "([^"]+)"\]')
+
+# .gitmodules 解析缓存：{文件路径: (mtime_ns, 文件大小, 文件内容, submodule 名称集合)}
+_gitmodules_cache: dict[Path, tuple[int, int, str, set[str]]] = {}
+
+
+def _read_gitmodules(gitmodules_path: Path) -> tuple[str, set[str]]:
+    """读取 .gitmodules 内容及其中配置的 submodule 名称，文件未变化时直接返回缓存结果
+
+    Args:
+        gitmodules_path: .gitmodules 文件路径
+
+    Returns:
+        tuple[str, set[str]]: (文件内容, submodule 名称集合)，文件不存在时返回 ("", set())
+    """
+    try:
+        st = os.stat(gitmodules_path)
+    except FileNotFoundError:
+        return "", set()
+
+    cached = _gitmodules_cache.get(gitmodules_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2], cached[3]
+
+    content = gitmodules_path.read_text(encoding="utf-8")
+    sections = set(_SUBMODULE_HEADER_RE.findall(content))
+    _gitmodules_cache[gitmodules_path] = (st.st_mtime_ns, st.st_size, content, sections)
+    return content, sections
+
+
+def _get_submodule_relative_path(current_dir: Path, git_root: Path) -> str:
+    """计算当前目录下 .driving submodule 相对于 Git 仓库根目录的路径
+
+    Args:
+        current_dir: 当前工作目录
+        git_root: Git 仓库根目录
+
+    Returns:
+        str: submodule 相对路径，如 ".driving" 或 "sub/dir/.driving"
+    """
+    try:
+        relative_path = current_dir.relative_to(git_root)
+    except ValueError:
+        # 如果当前目录不在 Git 根目录下（理论上不会发生）
+        return ".driving"
+    return str(relative_path / ".driving") if str(relative_path) != "." else ".driving"
+
 
 def create_symlinks(current_dir: Path, submodule_path: Path):
     """创建软链接
@@ -33,27 +112,34 @@ def create_symlinks(current_dir: Path, submodule_path: Path):
             log_warning(f"目标不存在，跳过: {target_path}")
             continue
 
+        # 软链接使用相对路径
+        relative_target = os.path.relpath(target_path, current_dir)
+
+        # 一次 lstat 同时判断是否存在以及是否为软链接
+        try:
+            st = os.lstat(link_path)
+        except FileNotFoundError:
+            st = None
+
         # 如果软链接已存在
-        if link_path.exists() or link_path.is_symlink():
-            # 检查是否已经是正确的软链接
-            if link_path.is_symlink() and link_path.resolve() == target_path.resolve():
+        if st is not None:
+            # 检查是否已经是正确的软链接：先直接比较链接内容，不一致时再比较解析后的真实路径
+            if stat.S_ISLNK(st.st_mode) and (
+                os.readlink(link_path) == relative_target
+                or os.path.realpath(link_path) == os.path.realpath(target_path)
+            ):
                 log_info(f"软链接已存在: {link_name} -> {target_path.relative_to(current_dir)}")
                 continue
             else:
                 # 如果是文件/目录或错误的软链接，先删除
                 log_warning(f"检测到已存在的 {link_name}，将被替换为软链接")
-                if link_path.is_symlink():
-                    link_path.unlink()
-                elif link_path.is_dir():
-                    import shutil
-
+                if stat.S_ISDIR(st.st_mode):
                     shutil.rmtree(link_path)
                 else:
                     link_path.unlink()
 
-        # 创建软链接（使用相对路径）
+        # 创建软链接
         try:
-            relative_target = os.path.relpath(target_path, current_dir)
             os.symlink(relative_target, link_path)
             log_success(f"创建软链接: {link_name} -> {relative_target}")
         except Exception as e:
@@ -82,6 +168,8 @@ def install(url: str = None):
         driving install
         driving install --url https://github.com/your-org/driving
     """
+    import git
+
     try:
         # 确定使用的仓库地址（优先级：命令行参数 > 环境变量）
         repo_url = url if url else DRIVING_REPO_URL
@@ -115,41 +203,26 @@ def install(url: str = None):
             log_error("当前目录不在 Git 仓库中，请先执行 git init")
             raise click.Abort()
 
-        repo = git.Repo(git_root)
+        repo = _get_repo(git_root)
         submodule_path = current_dir / ".driving"
 
         # 计算相对于 Git 仓库根目录的相对路径
-        try:
-            relative_path = current_dir.relative_to(git_root)
-            submodule_relative_path = (
-                str(relative_path / ".driving") if str(relative_path) != "." else ".driving"
-            )
-        except ValueError:
-            # 如果当前目录不在 Git 根目录下（理论上不会发生）
-            submodule_relative_path = ".driving"
+        submodule_relative_path = _get_submodule_relative_path(current_dir, git_root)
 
         # 检查 .gitmodules 中是否已配置 .driving submodule
+        # 文件内容在后续解析 submodule URL 时复用，不再重复读取
         gitmodules_path = git_root / ".gitmodules"
-        submodule_exists_in_config = False
-
-        if gitmodules_path.exists():
-            gitmodules_content = gitmodules_path.read_text(encoding="utf-8")
-            # 检查是否包含当前路径的 .driving 配置
-            if f'[submodule "{submodule_relative_path}"]' in gitmodules_content:
-                submodule_exists_in_config = True
+        gitmodules_content, gitmodules_sections = _read_gitmodules(gitmodules_path)
+        submodule_exists_in_config = submodule_relative_path in gitmodules_sections
 
         # 检查 .driving 是否已存在
         if submodule_path.exists():
             # 检查是否包含必要的文件（gitlist.json 或 ai-docs 等）
-            contents = list(submodule_path.iterdir())
-            # 过滤掉 .git、submodules 和 .gitignore
-            essential_contents = [
-                item
-                for item in contents
-                if item.name not in [".git", ".DS_Store", "submodules", ".gitignore"]
-            ]
-
-            if len(essential_contents) == 0 and submodule_exists_in_config:
+            # 过滤掉 .git、submodules 和 .gitignore，找到任意一个必要文件即可
+            with os.scandir(submodule_path) as it:
+                has_essential = any(entry.name not in _NON_ESSENTIAL_NAMES for entry in it)
+
+            if not has_essential and submodule_exists_in_config:
                 # 目录缺少必要文件且 .gitmodules 中已配置，尝试通过 git submodule update 拉取内容
                 log_warning("检测到 .driving 目录缺少必要文件，但 .gitmodules 中已配置")
                 log_info("尝试拉取 submodule 内容...")
@@ -166,8 +239,6 @@ def install(url: str = None):
                         log_info("Submodule 不在 Git 索引中，尝试重新添加...")
                         
                         # 从 .gitmodules 读取 URL
-                        gitmodules_content = gitmodules_path.read_text(encoding="utf-8")
-                        import re
                         # 查找对应 submodule 的 URL
                         pattern = rf'\[submodule "{re.escape(submodule_relative_path)}"\].*?url\s*=\s*(.+?)(?:\n\[|$)'
                         match = re.search(pattern, gitmodules_content, re.DOTALL)
@@ -177,7 +248,6 @@ def install(url: str = None):
                             log_info(f"从 .gitmodules 读取到 URL: {submodule_url}")
                             
                             # 删除空目录
-                            import shutil
                             shutil.rmtree(submodule_path)
                             
                             # 重新添加 submodule
@@ -207,7 +277,7 @@ def install(url: str = None):
                     log_info("提示：请检查 .gitmodules 文件中的 URL 配置是否正确")
                     log_info("或者尝试手动删除 .driving 目录后重新执行 install 命令")
                     raise click.Abort()
-            elif len(essential_contents) == 0 and not submodule_exists_in_config:
+            elif not has_essential and not submodule_exists_in_config:
                 # 目录缺少必要文件但 .gitmodules 中未配置，可能是手动创建的目录
                 log_error("当前目录存在 .driving 目录，但缺少必要文件且 .gitmodules 中未配置")
                 log_info("请先删除该目录后重试：rm -rf .driving")
@@ -236,11 +306,7 @@ def install(url: str = None):
                 # 如果提供了自定义 URL，先更新 .gitmodules 中的 URL
                 if url:
                     log_info(f"更新 .gitmodules 中的 URL 为: {url}")
-                    # 读取 .gitmodules
-                    gitmodules_content = gitmodules_path.read_text(encoding="utf-8")
-                    
                     # 使用正则表达式替换对应 submodule 的 URL
-                    import re
                     pattern = rf'(\[submodule "{re.escape(submodule_relative_path)}"\].*?url\s*=\s*)(.+?)(\n)'
                     replacement = rf'\g<1>{url}\g<3>'
                     new_content = re.sub(pattern, replacement, gitmodules_content, flags=re.DOTALL)
@@ -291,16 +357,6 @@ submodules/
         log_info(f"正在添加 driving 作为 Git submodule...")
         log_info(f"仓库地址: {repo_url}")
 
-        # 计算相对于 Git 仓库根目录的相对路径
-        try:
-            relative_path = current_dir.relative_to(git_root)
-            submodule_relative_path = (
-                str(relative_path / ".driving") if str(relative_path) != "." else ".driving"
-            )
-        except ValueError:
-            # 如果当前目录不在 Git 根目录下（理论上不会发生）
-            submodule_relative_path = ".driving"
-
         # 添加 submodule
         repo.create_submodule(submodule_relative_path, submodule_relative_path, url=repo_url)
 
@@ -351,6 +407,8 @@ def uninstall():
 
     如果当前目录存在 gitlist.json 文件（本地模式），则不需要执行此命令。
     """
+    import git
+
     try:
         # 检查当前目录是否存在 gitlist.json（本地模式）
         current_dir = Path.cwd()
@@ -368,43 +426,39 @@ def uninstall():
             log_error("当前目录不在 Git 仓库中")
             raise click.Abort()
 
-        repo = git.Repo(git_root)
         submodule_path = current_dir / ".driving"
 
         # 计算相对于 Git 仓库根目录的相对路径
-        try:
-            relative_path = current_dir.relative_to(git_root)
-            submodule_relative_path = (
-                str(relative_path / ".driving") if str(relative_path) != "." else ".driving"
-            )
-        except ValueError:
-            submodule_relative_path = ".driving"
-
-        # 检查 .driving submodule 是否存在
-        submodule = None
-        for sm in repo.submodules:
-            if sm.path == submodule_relative_path:
-                submodule = sm
-                break
-
-        if not submodule:
+        submodule_relative_path = _get_submodule_relative_path(current_dir, git_root)
+
+        # 直接从 .gitmodules 检查 .driving submodule 是否存在，无需加载全部 submodule 信息
+        _, gitmodules_sections = _read_gitmodules(git_root / ".gitmodules")
+        if submodule_relative_path not in gitmodules_sections:
             log_error(f"当前目录不存在 .driving submodule")
             log_info(f"查找路径: {submodule_relative_path}")
             raise click.Abort()
 
+        # 已跟踪文件存在未提交的修改时不移除，避免丢失修改
+        if (submodule_path / ".git").exists() and run_git(
+            submodule_path, "status", "--porcelain", "--untracked-files=no"
+        ).stdout.strip():
+            log_error(f"{submodule_relative_path} 中存在未提交的修改，请先提交或放弃修改")
+            raise click.Abort()
+
         log_warning("⚠️  警告：这将删除 .driving 目录及其中的所有框架仓库！")
         log_info("正在移除 driving Git submodule...")
 
-        # 移除 submodule
-        submodule.remove()
+        # 移除 submodule：注销工作区并从索引和 .gitmodules 中删除
+        run_git(git_root, "submodule", "deinit", "-f", "--", submodule_relative_path)
+        run_git(git_root, "rm", "-f", "--", submodule_relative_path)
 
         log_success("Git submodule 移除成功！")
         log_info("提示：请执行以下命令提交更改：")
         log_info("  git add .gitmodules")
         log_info("  git commit -m 'Remove driving submodule'")
 
-    except git.exc.GitCommandError as e:
-        log_error(f"移除 Git submodule 失败: {e}")
+    except subprocess.CalledProcessError as e:
+        log_error(f"移除 Git submodule 失败: {git_error_message(e)}")
         raise click.Abort()
     except Exception as e:
         log_error(f"移除 Git submodule 失败: {e}")
@@ -1,9 +1,9 @@
 """Driving 仓库管理命令"""
 
+import subprocess
 from pathlib import Path
 
 import click
-import git
 
 from driving.utils.config import (
     DEFAULT_COMMIT_MESSAGE,
@@ -11,9 +11,35 @@ from driving.utils.config import (
     get_driving_dir,
     is_local_mode,
 )
+from driving.utils.git_helper import git_error_message, run_git
 from driving.utils.logger import log_error, log_info, log_success, log_warning
 
 
+def _git_status_entries(repo_dir: Path) -> list[tuple[str, str]]:
+    """解析 git status --porcelain=v1 -z -uall 的输出
+
+    Args:
+        repo_dir: 仓库目录
+
+    Returns:
+        list[tuple[str, str]]: (两位状态码, 文件路径) 列表，工作区干净时为空列表
+    """
+    fields = run_git(repo_dir, "status", "--porcelain=v1", "-z", "-uall").stdout.split("\0")
+    entries = []
+    i = 0
+    while i < len(fields):
+        field = fields[i]
+        i += 1
+        if not field:
+            continue
+        code = field[:2]
+        entries.append((code, field[3:]))
+        # 重命名/复制条目后面紧跟原路径字段
+        if "R" in code or "C" in code:
+            i += 1
+    return entries
+
+
 @click.command()
 def pull():
     """更新 Driving 配置
@@ -43,18 +69,19 @@ def pull():
         else:
             log_info("正在更新 .driving 仓库...")
 
-        repo = git.Repo(driving_dir)
-
-        # 检查是否有未提交的修改
-        if repo.is_dirty(untracked_files=True):
+        # 检查是否有未提交的修改（一次 git status 同时得到未跟踪文件和已修改文件）
+        status_entries = _git_status_entries(driving_dir)
+        if status_entries:
             log_warning("检测到未提交的修改：")
             # 显示修改的文件
-            if repo.untracked_files:
+            untracked_files = [path for code, path in status_entries if code == "??"]
+            if untracked_files:
                 log_info("  未跟踪的文件：")
-                for file in repo.untracked_files:
+                for file in untracked_files:
                     log_info(f"    - {file}")
 
-            changed_files = [item.a_path for item in repo.index.diff(None)]
+            # 工作区相对于暂存区的修改（状态码第二列）
+            changed_files = [path for code, path in status_entries if code[1] not in " ?!"]
             if changed_files:
                 log_info("  已修改的文件：")
                 for file in changed_files:
@@ -67,44 +94,41 @@ def pull():
             raise click.Abort()
 
         # 检查是否有远程仓库
-        if not repo.remotes:
+        if not run_git(driving_dir, "remote").stdout.strip():
             log_error("未配置远程仓库")
             raise click.Abort()
 
         # 检查当前是否在分支上（处理 detached HEAD 状态）
-        if repo.head.is_detached:
+        head_ref = run_git(driving_dir, "symbolic-ref", "-q", "--short", "HEAD", check=False)
+        if head_ref.returncode != 0:
             log_warning("检测到 detached HEAD 状态，正在切换到 main 分支...")
-            try:
-                # 尝试切换到 main 分支
-                repo.git.checkout("main")
+            # 尝试切换到 main 分支，如果 main 分支不存在，尝试 master 分支
+            if run_git(driving_dir, "checkout", "main", check=False).returncode == 0:
                 log_success("已切换到 main 分支")
-            except git.exc.GitCommandError:
-                # 如果 main 分支不存在，尝试 master 分支
-                try:
-                    repo.git.checkout("master")
-                    log_success("已切换到 master 分支")
-                except git.exc.GitCommandError:
-                    log_error("无法切换到 main 或 master 分支")
-                    log_info("提示：请手动切换到正确的分支：")
-                    log_info(f"  cd {driving_dir}")
-                    log_info("  git branch -a  # 查看所有分支")
-                    log_info("  driving checkout <branch-name>  # 切换到目标分支")
-                    raise click.Abort()
+            elif run_git(driving_dir, "checkout", "master", check=False).returncode == 0:
+                log_success("已切换到 master 分支")
+            else:
+                log_error("无法切换到 main 或 master 分支")
+                log_info("提示：请手动切换到正确的分支：")
+                log_info(f"  cd {driving_dir}")
+                log_info("  git branch -a  # 查看所有分支")
+                log_info("  driving checkout <branch-name>  # 切换到目标分支")
+                raise click.Abort()
 
         # 获取当前分支名
-        current_branch = repo.active_branch.name
+        current_branch = run_git(driving_dir, "symbolic-ref", "--short", "HEAD").stdout.strip()
         log_info(f"当前分支: {current_branch}")
 
         # 拉取更新
-        repo.remotes.origin.pull(current_branch)
+        run_git(driving_dir, "pull", "origin", current_branch)
         log_success("更新成功！")
 
         if not local_mode:
             log_info("提示：如需提交更新，请在项目根目录执行：")
             log_info("  driving commit 'Update by driving'")
-    except git.exc.GitCommandError as e:
-        error_msg = str(e)
-        log_error(f"更新失败: {e}")
+    except subprocess.CalledProcessError as e:
+        error_msg = git_error_message(e)
+        log_error(f"更新失败: {error_msg}")
 
         # 提供更详细的错误提示
         if "fatal: couldn't find remote ref" in error_msg:
@@ -163,13 +187,14 @@ def commit(message: str):
         else:
             log_info("正在提交 .driving 的修改...")
 
-        repo = git.Repo(driving_dir)
-        repo.git.add(A=True)
-        repo.index.commit(message)
+        run_git(driving_dir, "add", "-A")
+        # 与此前的行为保持一致：没有修改时也创建提交
+        # 输出不展示给用户，使用 --quiet 跳过提交后的变更统计（需要再与父提交做一次 diff）
+        run_git(driving_dir, "commit", "--allow-empty", "--quiet", "-m", message)
         log_success(f"提交成功: {message}")
         log_info("提示：如需推送到远程，请执行 'driving push'")
-    except git.exc.GitCommandError as e:
-        log_error(f"提交失败: {e}")
+    except subprocess.CalledProcessError as e:
+        log_error(f"提交失败: {git_error_message(e)}")
         raise click.Abort()
     except Exception as e:
         log_error(f"提交失败: {e}")
@@ -206,18 +231,18 @@ def push():
         else:
             log_info("正在推送到远程仓库...")
 
-        repo = git.Repo(driving_dir)
-        repo.remotes.origin.push()
+        run_git(driving_dir, "push", "origin")
         log_success("推送成功！")
 
         if not local_mode:
             log_info("提示：别忘了在项目根目录提交 submodule 的更新：")
             log_info("  driving commit 'Update by driving'")
-    except git.exc.GitCommandError as e:
-        if "rejected" in str(e):
+    except subprocess.CalledProcessError as e:
+        error_msg = git_error_message(e)
+        if "rejected" in error_msg:
             log_error("推送失败：存在冲突，请先执行 'driving pull' 并解决冲突")
         else:
-            log_error(f"推送失败: {e}")
+            log_error(f"推送失败: {error_msg}")
         raise click.Abort()
     except Exception as e:
         log_error(f"推送失败: {e}")
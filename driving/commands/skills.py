@@ -1,22 +1,62 @@
 """Skills 管理命令"""
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
 
 import click
 
 from driving.utils.config import is_local_mode
+from driving.utils.json_helper import dumps_bytes as json_dumps_bytes
+from driving.utils.json_helper import loads as json_loads
 from driving.utils.logger import log_error, log_info, log_success, log_warning
 
-# 尝试导入 yaml，如果失败则使用简单解析器
-try:
-    import yaml
+# PyYAML 加载器缓存：_UNSET 表示尚未尝试导入，None 表示 PyYAML 未安装（使用简单解析器）
+_UNSET = object()
+_yaml_loader = _UNSET
 
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
-    # 警告信息延迟到实际使用时输出，避免影响 JSON 输出
+# 并发读取 SKILL.md 的最大线程数
+_SCAN_MAX_WORKERS = 32
+
+# 简化 YAML 解析：name / description 字段行（忽略行首尾空白）
+_SIMPLE_YAML_FIELD_RE = re.compile(r"^[^\S\n]*(name|description):[^\S\n]*(.*?)[^\S\n]*$", re.M)
+# 简化 YAML 解析：紧跟在 "description: |" 之后的缩进行
+_SIMPLE_YAML_BLOCK_RE = re.compile(r"(?:\n(?:  |\t)[^\n]*)*")
+
+# 技能扫描缓存文件名（位于 skills 所属仓库的 Git 目录中，不会出现在工作区改动里）
+_SKILLS_CACHE_NAME = "driving-skills-cache.json"
+# 缓存格式版本，格式变化时递增以使旧缓存失效
+_SKILLS_CACHE_VERSION = 1
+
+# AGENTS.md 不含 skills_system 标签时，超过该长度（字符数）改为直接追加，不再重写整个文件
+_AGENTS_MD_APPEND_THRESHOLD = 1024 * 1024
+
+# AGENTS.md 中的 skills_system 标签
+_SKILLS_SYSTEM_RE = re.compile(r'<skills_system priority="1">(.*?)</skills_system>', re.DOTALL)
+# 匹配换行符后的 <available_skills> 标签，避免匹配到 usage 文本中的 "<available_skills>"
+_AVAILABLE_SKILLS_RE = re.compile(r"\n<available_skills>.*?</available_skills>", re.DOTALL)
+
+
+def _get_yaml_loader() -> Optional[type]:
+    """按需导入 PyYAML 并返回安全加载器，结果在进程内缓存
+
+    优先使用 libyaml 实现的 C 加载器，未编译 libyaml 时使用纯 Python 实现。
+
+    Returns:
+        Optional[type]: YAML 加载器类，PyYAML 未安装时返回 None
+    """
+    global _yaml_loader
+    if _yaml_loader is _UNSET:
+        try:
+            import yaml
+
+            _yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        except ImportError:
+            _yaml_loader = None
+    return _yaml_loader
 
 
 def parse_yaml_simple(yaml_content: str) -> Optional[Dict[str, str]]:
@@ -36,56 +76,25 @@ def parse_yaml_simple(yaml_content: str) -> Optional[Dict[str, str]]:
         Dict: 包含 name 和 description 的字典，如果解析失败则返回 None
     """
     result = {}
-    lines = yaml_content.split("\n")
-    i = 0
-
-    while i < len(lines):
-        line = lines[i].strip()
+    # 多行 description 已消费到的位置，其中的缩进行不再作为字段解析
+    block_end = 0
 
-        # 跳过空行和注释
-        if not line or line.startswith("#"):
-            i += 1
+    for match in _SIMPLE_YAML_FIELD_RE.finditer(yaml_content):
+        if match.start() < block_end:
             continue
 
-        # 解析 name
-        if line.startswith("name:"):
-            value = line[5:].strip()
-            result["name"] = value
-            i += 1
-            continue
-
-        # 解析 description
-        if line.startswith("description:"):
-            value = line[12:].strip()
-
-            # 单行 description
-            if value and value != "|":
-                result["description"] = value
-                i += 1
-                continue
-
-            # 多行 description (使用 |)
-            if value == "|":
-                desc_lines = []
-                i += 1
-                # 读取缩进的行
-                while i < len(lines):
-                    next_line = lines[i]
-                    # 如果是缩进的行，添加到 description
-                    if next_line.startswith("  ") or next_line.startswith("\t"):
-                        desc_lines.append(next_line.strip())
-                        i += 1
-                    else:
-                        break
-                result["description"] = " ".join(desc_lines)
-                continue
+        key, value = match.group(1), match.group(2)
 
-            # 空 description
-            result["description"] = ""
-            i += 1
+        # 多行 description (使用 |)：读取紧随其后的缩进行
+        if key == "description" and value == "|":
+            block = _SIMPLE_YAML_BLOCK_RE.match(yaml_content, match.end())
+            block_end = block.end()
+            result["description"] = " ".join(
+                line.strip() for line in block.group(0).split("\n")[1:]
+            )
             continue
 
-        i += 1
+        result[key] = value
 
     # 验证必需字段
     if "name" not in result:
@@ -104,23 +113,72 @@ def find_skills_dir() -> Optional[Path]:
     Returns:
         Path: skills 目录路径，如果不存在则返回 None
     """
-    current_dir = Path.cwd()
-
-    # 本地模式：直接在当前目录查找
+    # 本地模式：直接在当前目录查找；标准模式：在 .driving 目录查找
+    # 直接检查最深一层目录，中间目录不存在时 isdir 同样返回 False，无需逐级检查
     if is_local_mode():
-        skills_dir = current_dir / "ai-docs" / "skills"
-        if skills_dir.exists():
-            return skills_dir
+        skills_dir = os.path.join(os.getcwd(), "ai-docs", "skills")
+    else:
+        skills_dir = os.path.join(os.getcwd(), ".driving", "ai-docs", "skills")
+
+    if os.path.isdir(skills_dir):
+        return Path(skills_dir)
+    return None
+
+
+def parse_skill_front_matter(
+    content: str, warnings: Optional[List[str]] = None
+) -> Optional[Dict[str, str]]:
+    """解析 SKILL.md 内容中的 YAML 头信息
+
+    Args:
+        content: SKILL.md 文件内容
+        warnings: 警告信息收集列表（可选），指定时警告追加到列表中而不直接输出
+
+    Returns:
+        Dict: 包含 name 和 description 的字典，如果解析失败则返回 None
+    """
+    # 检查是否有 YAML 头
+    if not content.startswith("---"):
         return None
 
-    # 标准模式：在 .driving 目录查找
-    driving_dir = current_dir / ".driving"
-    if driving_dir.exists():
-        skills_dir = driving_dir / "ai-docs" / "skills"
-        if skills_dir.exists():
-            return skills_dir
+    # 提取 YAML 头（在两个 --- 之间），只切出头部，不复制正文
+    end = content.find("---", 3)
+    if end == -1:
+        return None
 
-    return None
+    yaml_content = content[3:end].strip()
+
+    # 快速预检：不含 name 字段时两种解析器都会返回 None，无需调用解析器
+    # （只检查 "name"，不要求行首 "name:"，以兼容缩进和 "name :" 等合法写法）
+    if "name" not in yaml_content:
+        return None
+
+    # 优先使用 PyYAML 解析
+    loader = _get_yaml_loader()
+    if loader is not None:
+        import yaml
+
+        try:
+            yaml_data = yaml.load(yaml_content, Loader=loader)
+
+            if not yaml_data or "name" not in yaml_data:
+                return None
+
+            return {
+                "name": yaml_data.get("name", ""),
+                "description": yaml_data.get("description", ""),
+            }
+        except Exception as e:
+            message = f"PyYAML 解析失败，尝试使用简化解析器: {e}"
+            if warnings is None:
+                log_warning(message)
+            else:
+                warnings.append(message)
+            # 降级到简化解析器
+            return parse_yaml_simple(yaml_content)
+    else:
+        # 使用简化解析器
+        return parse_yaml_simple(yaml_content)
 
 
 def parse_skill_yaml(skill_md_path: Path) -> Optional[Dict[str, str]]:
@@ -133,47 +191,126 @@ def parse_skill_yaml(skill_md_path: Path) -> Optional[Dict[str, str]]:
         Dict: 包含 name 和 description 的字典，如果解析失败则返回 None
     """
     try:
-        content = skill_md_path.read_text(encoding="utf-8")
-
-        # 检查是否有 YAML 头
-        if not content.startswith("---"):
-            return None
-
-        # 提取 YAML 头（在两个 --- 之间）
-        parts = content.split("---", 2)
-        if len(parts) < 3:
-            return None
-
-        yaml_content = parts[1].strip()
-
-        # 优先使用 PyYAML 解析
-        if HAS_YAML:
-            try:
-                yaml_data = yaml.safe_load(yaml_content)
-
-                if not yaml_data or "name" not in yaml_data:
-                    return None
-
-                return {
-                    "name": yaml_data.get("name", ""),
-                    "description": yaml_data.get("description", ""),
-                }
-            except Exception as e:
-                log_warning(f"PyYAML 解析失败，尝试使用简化解析器: {e}")
-                # 降级到简化解析器
-                return parse_yaml_simple(yaml_content)
-        else:
-            # 使用简化解析器
-            return parse_yaml_simple(yaml_content)
-
+        return parse_skill_front_matter(skill_md_path.read_text(encoding="utf-8"))
     except Exception as e:
         log_warning(f"解析 {skill_md_path} 失败: {e}")
         return None
 
 
+def _get_skills_cache_path(skills_dir: Path) -> Optional[str]:
+    """获取技能扫描缓存文件路径
+
+    skills 目录为 <仓库>/ai-docs/skills，缓存文件放在该仓库的 Git 目录中。
+    .driving 作为 submodule 时 .git 是指向实际 Git 目录的文件（gitdir: <路径>）。
+
+    Args:
+        skills_dir: skills 目录路径
+
+    Returns:
+        Optional[str]: 缓存文件路径，skills 目录不在 Git 仓库根目录下时返回 None
+    """
+    repo_dir = os.path.dirname(os.path.dirname(skills_dir))
+    dot_git = os.path.join(repo_dir, ".git")
+    if os.path.isdir(dot_git):
+        return os.path.join(dot_git, _SKILLS_CACHE_NAME)
+
+    try:
+        with open(dot_git, "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    return os.path.join(repo_dir, content[len("gitdir:") :].strip(), _SKILLS_CACHE_NAME)
+
+
+def _read_skills_cache(cache_path: Optional[str], parser: str) -> Dict[str, dict]:
+    """读取技能扫描缓存
+
+    Args:
+        cache_path: 缓存文件路径
+        parser: 当前使用的解析器（yaml / simple），与缓存记录不一致时缓存失效
+
+    Returns:
+        Dict: {技能目录名: 缓存条目}，缓存不存在或无效时返回空字典
+    """
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, "rb") as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != _SKILLS_CACHE_VERSION
+        or cache.get("parser") != parser
+        or not isinstance(cache.get("entries"), dict)
+    ):
+        return {}
+    return cache["entries"]
+
+
+def _write_skills_cache(cache_path: Optional[str], parser: str, entries: Dict[str, dict]) -> None:
+    """写入技能扫描缓存（先写临时文件再 os.replace，中断时不会留下不完整的缓存）
+
+    缓存只用于加速，写入失败（如 Git 目录只读、技能信息无法序列化）时静默忽略。
+
+    Args:
+        cache_path: 缓存文件路径
+        parser: 当前使用的解析器（yaml / simple）
+        entries: {技能目录名: 缓存条目}
+    """
+    if cache_path is None:
+        return
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        data = json_dumps_bytes(
+            {"version": _SKILLS_CACHE_VERSION, "parser": parser, "entries": entries}
+        )
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_skill_md(
+    skill_md: str, cached: Optional[dict] = None
+) -> Tuple[Optional[Dict[str, str]], List[str], dict]:
+    """读取并解析单个 SKILL.md 文件（在线程池中执行，不直接输出日志）
+
+    SKILL.md 的修改时间和大小与缓存条目一致时直接复用缓存的解析结果，不再读取文件。
+
+    Args:
+        skill_md: SKILL.md 文件路径
+        cached: 该技能的缓存条目（可选）
+
+    Returns:
+        Tuple: (技能信息，解析失败为 None；解析过程中的警告信息列表；新的缓存条目)
+
+    Raises:
+        FileNotFoundError: SKILL.md 文件不存在
+    """
+    st = os.stat(skill_md)
+    key = [st.st_mtime_ns, st.st_size]
+    if cached is not None and cached.get("key") == key:
+        return cached.get("info"), cached.get("warnings", []), cached
+
+    warnings = []
+    with open(skill_md, "r", encoding="utf-8") as f:
+        skill_info = parse_skill_front_matter(f.read(), warnings)
+    return skill_info, warnings, {"key": key, "info": skill_info, "warnings": warnings}
+
+
 def scan_skills(skills_dir: Path) -> List[Dict[str, str]]:
     """扫描 skills 目录下的所有技能
 
+    解析结果按 SKILL.md 的修改时间和大小缓存，未变化的技能不再重复读取和解析。
+
     Args:
         skills_dir: skills 目录路径
 
@@ -183,23 +320,40 @@ def scan_skills(skills_dir: Path) -> List[Dict[str, str]]:
     skills = []
     skipped_empty_desc = []
 
-    # 遍历 skills 目录下的所有子目录
-    for skill_dir in skills_dir.iterdir():
-        if not skill_dir.is_dir():
+    # 遍历 skills 目录下的所有子目录（DirEntry.is_dir 优先使用目录项自带的类型信息，无需额外 stat）
+    with os.scandir(skills_dir) as it:
+        candidates = [
+            (entry.name, os.path.join(entry.path, "SKILL.md"))
+            for entry in it
+            # 跳过特殊目录
+            if entry.is_dir() and entry.name not in ["other", "__pycache__"]
+        ]
+
+    parser = "simple" if _get_yaml_loader() is None else "yaml"
+    cache_path = _get_skills_cache_path(skills_dir)
+    cache = _read_skills_cache(cache_path, parser)
+    new_cache = {}
+
+    # 并发读取并解析 SKILL.md，日志在主线程中按目录顺序输出
+    with ThreadPoolExecutor(max_workers=min(_SCAN_MAX_WORKERS, len(candidates)) or 1) as executor:
+        futures = [
+            executor.submit(_load_skill_md, skill_md, cache.get(skill_dir_name))
+            for skill_dir_name, skill_md in candidates
+        ]
+
+    for (skill_dir_name, skill_md), future in zip(candidates, futures):
+        try:
+            skill_info, warnings, new_cache[skill_dir_name] = future.result()
+        except FileNotFoundError:
+            log_warning(f"跳过 {skill_dir_name}：未找到 SKILL.md 文件")
             continue
+        except Exception as e:
+            log_warning(f"解析 {skill_md} 失败: {e}")
+            skill_info, warnings = None, []
 
-        # 跳过特殊目录
-        if skill_dir.name in ["other", "__pycache__"]:
-            continue
-
-        # 查找 SKILL.md 文件
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_md.exists():
-            log_warning(f"跳过 {skill_dir.name}：未找到 SKILL.md 文件")
-            continue
+        for message in warnings:
+            log_warning(message)
 
-        # 解析 YAML 头
-        skill_info = parse_skill_yaml(skill_md)
         if skill_info:
             # 检查 description 是否为空
             if not skill_info["description"] or not skill_info["description"].strip():
@@ -210,7 +364,7 @@ def scan_skills(skills_dir: Path) -> List[Dict[str, str]]:
             skills.append(skill_info)
             log_info(f"发现技能: {skill_info['name']}")
         else:
-            log_warning(f"跳过 {skill_dir.name}：YAML 头信息不完整")
+            log_warning(f"跳过 {skill_dir_name}：YAML 头信息不完整")
 
     # 汇总跳过的技能
     if skipped_empty_desc:
@@ -220,6 +374,9 @@ def scan_skills(skills_dir: Path) -> List[Dict[str, str]]:
             log_info(f"  - {name}")
         log_info("提示：请为这些技能补充 description 后重新运行 skills-sync")
 
+    if new_cache != cache:
+        _write_skills_cache(cache_path, parser, new_cache)
+
     return skills
 
 
@@ -227,34 +384,28 @@ def generate_available_skills_content(skills: List[Dict[str, str]]) -> str:
     """生成 available_skills 标签内部的内容（不包含标签本身）
 
     Args:
-        skills: 技能列表
+        skills: 技能列表（需已按技能名称排序，按列表顺序输出）
 
     Returns:
         str: available_skills 标签内部的内容
     """
-    # 按技能名称排序
-    sorted_skills = sorted(skills, key=lambda x: x["name"])
-
-    # 生成技能列表
-    skills_content = ""
-
-    for skill in sorted_skills:
-        skills_content += f"""
-<skill>
-<name>{skill['name']}</name>
-<description>{skill['description']}</description>
-<location>project</location>
-</skill>
-"""
-
-    return skills_content
+    # 生成技能列表（name / description 按 XML 文本转义）
+    parts = [
+        "\n<skill>\n"
+        f"<name>{escape(str(skill['name']))}</name>\n"
+        f"<description>{escape(str(skill['description']))}</description>\n"
+        "<location>project</location>\n"
+        "</skill>\n"
+        for skill in skills
+    ]
+    return "".join(parts)
 
 
 def generate_full_skills_system_content(skills: List[Dict[str, str]]) -> str:
     """生成完整的 skills_system 标签内的内容（用于新建文件或不存在标签时）
 
     Args:
-        skills: 技能列表
+        skills: 技能列表（需已按技能名称排序）
 
     Returns:
         str: skills_system 标签内的完整内容
@@ -296,11 +447,15 @@ def update_agents_md(agents_md_path: Path, skills: List[Dict[str, str]]) -> None
 
     Args:
         agents_md_path: AGENTS.md 文件路径
-        skills: 技能列表
+        skills: 技能列表（需已按技能名称排序）
     """
-    # 读取现有内容
+    # 读取现有内容（newline="" 保留原始换行符，便于追加时计算文件内的字节偏移）
+    raw_content = None
     if agents_md_path.exists():
-        original_content = agents_md_path.read_text(encoding="utf-8")
+        with open(agents_md_path, "r", encoding="utf-8", newline="") as f:
+            raw_content = f.read()
+        # 与 read_text 的行为一致，统一换行符
+        original_content = raw_content.replace("\r\n", "\n").replace("\r", "\n")
     else:
         # 如果文件不存在，创建基础结构
         original_content = """# AGENTS
@@ -309,14 +464,8 @@ def update_agents_md(agents_md_path: Path, skills: List[Dict[str, str]]) -> None
 """
 
     # 检查是否存在 skills_system 标签
-    skills_system_pattern = r'<skills_system priority="1">(.*?)</skills_system>'
-
-    if re.search(skills_system_pattern, original_content, re.DOTALL):
+    if _SKILLS_SYSTEM_RE.search(original_content):
         # 存在 skills_system 标签，只更新 available_skills 部分
-        # 使用更精确的正则表达式：匹配换行符后的 <available_skills> 标签
-        # 这样可以避免匹配到 usage 文本中的 "<available_skills>"
-        available_skills_pattern = r"\n<available_skills>.*?</available_skills>"
-
         # 生成新的 available_skills 内容（包含标签）
         new_available_skills_inner = generate_available_skills_content(skills)
         new_available_skills_full = (
@@ -324,31 +473,31 @@ def update_agents_md(agents_md_path: Path, skills: List[Dict[str, str]]) -> None
         )
 
         # 检查是否存在 available_skills 标签
-        if re.search(available_skills_pattern, original_content, re.DOTALL):
+        if _AVAILABLE_SKILLS_RE.search(original_content):
             # 替换整个 available_skills 标签及其内容
-            new_content = re.sub(
-                available_skills_pattern,
-                new_available_skills_full,
-                original_content,
-                flags=re.DOTALL,
-            )
+            new_content = _AVAILABLE_SKILLS_RE.sub(new_available_skills_full, original_content)
         else:
             # 如果不存在 available_skills，在 skills_system 标签内添加
             # 这种情况理论上不应该发生，但为了健壮性还是处理一下
             full_content = generate_full_skills_system_content(skills)
-            new_content = re.sub(
-                skills_system_pattern,
+            new_content = _SKILLS_SYSTEM_RE.sub(
                 f'<skills_system priority="1">{full_content}\n</skills_system>',
                 original_content,
-                flags=re.DOTALL,
             )
     else:
         # 不存在 skills_system 标签，插入完整的 skills_system 内容
         full_content = generate_full_skills_system_content(skills)
-        new_content = (
-            original_content.rstrip()
-            + f'\n\n<skills_system priority="1">{full_content}\n</skills_system>\n'
-        )
+        skills_block = f'\n\n<skills_system priority="1">{full_content}\n</skills_system>\n'
+
+        # 大文件只需截掉末尾空白并追加新内容，无需重写整个文件
+        if raw_content is not None and len(raw_content) >= _AGENTS_MD_APPEND_THRESHOLD:
+            with open(agents_md_path, "r+b") as f:
+                f.seek(len(raw_content.rstrip().encode("utf-8")))
+                f.truncate()
+                f.write(skills_block.encode("utf-8"))
+            return
+
+        new_content = original_content.rstrip() + skills_block
 
     # 写入文件
     agents_md_path.write_text(new_content, encoding="utf-8")
@@ -366,8 +515,8 @@ def skills_sync():
     - 本地模式：从 ai-docs/skills 读取技能，更新根目录的 AGENTS.md
     """
     try:
-        # 在命令执行时输出 PyYAML 警告
-        if not HAS_YAML:
+        # 在命令执行时输出 PyYAML 警告（同时在主线程完成 PyYAML 导入，供扫描线程复用）
+        if _get_yaml_loader() is None:
             log_warning("PyYAML 未安装，将使用简化的 YAML 解析器")
             log_warning("建议安装 PyYAML 以获得更好的兼容性: pip3 install PyYAML")
 
@@ -391,6 +540,9 @@ def skills_sync():
 
         log_success(f"找到 {len(skills)} 个技能")
 
+        # 按技能名称排序，AGENTS.md 与下方的技能列表共用同一顺序
+        skills.sort(key=lambda x: x["name"])
+
         # 确定 AGENTS.md 文件路径（在项目根目录）
         agents_md_path = current_dir / "AGENTS.md"
 
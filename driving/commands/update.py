@@ -1,17 +1,34 @@
 """更新命令 - 检查和安装新版本"""
 
+import http.client
 import json
-import subprocess
+import os
+import time
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
 import click
+from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TransferSpeedColumn
 
 from driving import __version__
 from driving.utils.config import DRIVING_UPDATE_VERSION_URL, update_env_file
-from driving.utils.logger import log_error, log_info, log_success, log_warning
+from driving.utils.logger import get_console, log_error, log_info, log_success, log_warning
+
+# 版本信息缓存有效期（秒），有效期内不再请求服务器
+_VERSION_CACHE_TTL = 300
+
+# 下载时每次读取的块大小，较大的块可减少读取循环次数和文件写入的系统调用
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# 下载中断后从断点续传的最大重试次数
+_DOWNLOAD_RETRIES = 3
+# 并行分段下载的分段数
+_DOWNLOAD_PARTS = 8
+# 小于该大小的文件直接顺序下载，分段带来的额外连接开销不划算
+_PARALLEL_DOWNLOAD_MIN_SIZE = 4 * 1024 * 1024
 
 
 def get_current_version() -> str:
@@ -23,9 +40,54 @@ def get_current_version() -> str:
     return __version__
 
 
+def _get_version_cache_path() -> Path:
+    """获取版本信息缓存文件路径（遵循 XDG_CACHE_HOME，默认为 ~/.cache）
+
+    Returns:
+        Path: 缓存文件路径
+    """
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "driving" / "version_cache.json"
+
+
+def _load_version_cache() -> Dict[str, Dict[str, Any]]:
+    """读取版本信息缓存
+
+    Returns:
+        Dict: {version.json URL: {etag, last_modified, body, fetched_at}}，缓存不存在或无效时返回空字典
+    """
+    try:
+        cache = json.loads(_get_version_cache_path().read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_version_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    """写入版本信息缓存（先写临时文件再 os.replace），缓存只用于加速，写入失败时静默忽略
+
+    Args:
+        cache: {version.json URL: {etag, last_modified, body, fetched_at}}
+    """
+    cache_path = _get_version_cache_path()
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
 def fetch_version_info(version_url: str) -> Optional[Dict[str, Any]]:
     """从服务器获取最新版本信息
 
+    结果按 URL 缓存：缓存有效期内直接使用缓存；超过有效期后带 If-None-Match /
+    If-Modified-Since 头重新请求，服务器返回 304 时继续使用缓存内容。
+
     Args:
         version_url: version.json 文件的完整 URL
 
@@ -35,10 +97,41 @@ def fetch_version_info(version_url: str) -> Optional[Dict[str, Any]]:
     try:
         log_info(f"正在检查更新: {version_url}")
 
-        with urllib.request.urlopen(version_url, timeout=10) as response:
-            data = response.read()
-            version_info = json.loads(data.decode("utf-8"))
-            return version_info
+        cache = _load_version_cache()
+        cached = cache.get(version_url)
+        if not isinstance(cached, dict) or not isinstance(cached.get("body"), str):
+            cached = None
+        elif 0 <= time.time() - cached.get("fetched_at", 0) < _VERSION_CACHE_TTL:
+            return json.loads(cached["body"])
+
+        request = urllib.request.Request(version_url)
+        if cached is not None:
+            if cached.get("etag"):
+                request.add_header("If-None-Match", cached["etag"])
+            if cached.get("last_modified"):
+                request.add_header("If-Modified-Since", cached["last_modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                body = response.read().decode("utf-8")
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            # 304 Not Modified：服务器上的版本信息未变化，使用缓存内容
+            if e.code != 304 or cached is None:
+                raise
+            body = cached["body"]
+            headers = e.headers
+
+        version_info = json.loads(body)
+
+        cache[version_url] = {
+            "etag": headers.get("ETag") or (cached or {}).get("etag"),
+            "last_modified": headers.get("Last-Modified") or (cached or {}).get("last_modified"),
+            "body": body,
+            "fetched_at": time.time(),
+        }
+        _save_version_cache(cache)
+        return version_info
 
     except urllib.error.URLError as e:
         log_error(f"无法连接到更新服务器: {e.reason}")
@@ -62,23 +155,198 @@ def compare_versions(current: str, latest: str) -> int:
         int: -1 表示 current < latest，0 表示相等，1 表示 current > latest
     """
     try:
-        current_parts = [int(x) for x in current.split(".")]
-        latest_parts = [int(x) for x in latest.split(".")]
+        current_parts = tuple(map(int, current.split(".")))
+        latest_parts = tuple(map(int, latest.split(".")))
+    except Exception:
+        return 0
 
-        # 补齐长度
-        max_len = max(len(current_parts), len(latest_parts))
-        current_parts.extend([0] * (max_len - len(current_parts)))
-        latest_parts.extend([0] * (max_len - len(latest_parts)))
+    # 较短的版本号用 0 补齐（如 "2.2" 与 "2.2.0" 相等），遇到第一个不同的部分即可得出结果
+    for c, l in zip_longest(current_parts, latest_parts, fillvalue=0):
+        if c != l:
+            return -1 if c < l else 1
+    return 0
 
-        for c, l in zip(current_parts, latest_parts):
-            if c < l:
-                return -1
-            elif c > l:
-                return 1
 
-        return 0
-    except Exception:
-        return 0
+class _DownloadProgress:
+    """下载进度条，可在多个下载线程中同时更新（Rich 内部加锁并限制刷新频率）"""
+
+    def __init__(self, total_size: int):
+        self._progress = Progress(
+            TextColumn("[blue][INFO][/blue] 下载进度"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            console=get_console(),
+        )
+        # 总大小未知时（无 Content-Length）显示为不确定进度
+        self._task = self._progress.add_task("download", total=total_size or None)
+
+    def __enter__(self) -> "_DownloadProgress":
+        self._progress.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._progress.stop()
+
+    def advance(self, size: int) -> None:
+        """记录新下载的字节数
+
+        Args:
+            size: 新下载的字节数
+        """
+        self._progress.update(self._task, advance=size)
+
+
+def _get_range_total_size(response) -> Optional[int]:
+    """从 206 响应的 Content-Range 头（如 bytes 0-99/1000）中获取文件总大小
+
+    Args:
+        response: HTTP 响应对象
+
+    Returns:
+        Optional[int]: 文件总大小，服务端未按 Range 返回（如返回 200）或总大小未知时返回 None
+    """
+    if response.status != 206:
+        return None
+    _, _, total = response.headers.get("Content-Range", "").rpartition("/")
+    return int(total) if total.isdigit() else None
+
+
+def _download_range(
+    url: str, fd: int, start: int, end: int, progress: _DownloadProgress, response=None
+) -> None:
+    """下载 [start, end] 区间的数据并按偏移量写入文件（可在线程池中执行）
+
+    使用 os.pwrite 按位置写入，多个线程写入同一文件时互不影响文件指针。
+    连接中断或数据不完整时，从已写入的位置起重新请求剩余部分（Range: bytes=<已写入位置>-<end>），
+    最多重试 _DOWNLOAD_RETRIES 次，重试间隔按指数递增。
+
+    Args:
+        url: 下载地址
+        fd: 目标文件描述符
+        start: 起始偏移量
+        end: 结束偏移量（包含）
+        progress: 下载进度
+        response: 已建立的、数据从 start 处开始的 206 响应（可选），未指定时发起 Range 请求
+
+    Raises:
+        OSError: 重试后仍下载失败、服务端未按 Range 返回数据或数据不完整
+        http.client.HTTPException: 重试后仍下载失败
+    """
+    # 复用同一块缓冲区读取，避免每次读取都分配新的 bytes 对象
+    buffer = memoryview(bytearray(_DOWNLOAD_CHUNK_SIZE))
+    offset = start
+
+    for attempt in range(_DOWNLOAD_RETRIES + 1):
+        try:
+            if response is None:
+                request = urllib.request.Request(url, headers={"Range": f"bytes={offset}-{end}"})
+                response = urllib.request.urlopen(request, timeout=30)
+                if response.status != 206:
+                    raise IOError(f"服务端未按 Range 返回数据: bytes={offset}-{end}")
+
+            with response:
+                while offset <= end:
+                    size = response.readinto(buffer[: end + 1 - offset])
+                    if not size:
+                        raise IOError(f"分段下载不完整: bytes={start}-{end}")
+                    os.pwrite(fd, buffer[:size], offset)
+                    offset += size
+                    progress.advance(size)
+            return
+        except (OSError, http.client.HTTPException):
+            response = None
+            if attempt == _DOWNLOAD_RETRIES:
+                raise
+            time.sleep(2**attempt)
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """为文件预先分配 size 字节的磁盘空间（文件大小同时扩展为 size）
+
+    优先使用 posix_fallocate 一次性分配，避免边写边扩展带来的碎片和元数据更新；
+    平台或文件系统不支持时退化为 ftruncate。
+
+    Args:
+        fd: 文件描述符
+        size: 文件大小
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+def _download_file(url: str, tmp_file: BinaryIO) -> None:
+    """下载文件
+
+    首个请求带 Range: bytes=0- 头：服务端返回 206 时按 Range 下载（文件较大时其余区间分段并行下载，
+    首段直接复用该响应），连接中断后从断点续传；服务端不支持 Range（返回 200）时顺序读取该响应。
+
+    Args:
+        url: 下载地址
+        tmp_file: 目标文件（二进制写模式）
+
+    Raises:
+        Exception: 下载失败
+    """
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        total_size = _get_range_total_size(response)
+
+        if not total_size or not hasattr(os, "pwrite"):
+            # 服务端不支持 Range（返回 200）时顺序读取该响应，中断后无法续传
+            content_length = int(response.headers.get("Content-Length", 0))
+            if content_length > 0:
+                _preallocate(tmp_file.fileno(), content_length)
+
+            buffer = memoryview(bytearray(_DOWNLOAD_CHUNK_SIZE))
+            with _DownloadProgress(content_length) as progress:
+                while True:
+                    size = response.readinto(buffer)
+                    if not size:
+                        break
+                    tmp_file.write(buffer[:size])
+                    progress.advance(size)
+
+            # 截断到实际写入的长度，去掉预分配但未写入的部分
+            tmp_file.truncate()
+            return
+
+        fd = tmp_file.fileno()
+        _preallocate(fd, total_size)
+        parts = _DOWNLOAD_PARTS if total_size >= _PARALLEL_DOWNLOAD_MIN_SIZE else 1
+        part_size = -(-total_size // parts)
+        ranges = [
+            (start, min(start + part_size, total_size) - 1)
+            for start in range(0, total_size, part_size)
+        ]
+
+        with _DownloadProgress(total_size) as progress:
+            with ThreadPoolExecutor(max_workers=max(len(ranges) - 1, 1)) as executor:
+                futures = [
+                    executor.submit(_download_range, url, fd, start, end, progress)
+                    for start, end in ranges[1:]
+                ]
+                # 首段直接复用已建立的响应
+                _download_range(url, fd, *ranges[0], progress, response)
+
+            for future in futures:
+                future.result()
+
+
+def _log_permission_denied(yes: bool) -> None:
+    """输出无权限替换可执行文件的提示
+
+    Args:
+        yes: 是否使用了 -y 选项（用于生成 sudo 命令示例）
+    """
+    log_error("权限不足，无法替换文件")
+    log_info("请尝试使用 sudo 运行:")
+    log_info(f"  sudo driving update {'-y' if yes else ''}")
 
 
 @click.command("version")
@@ -170,7 +438,6 @@ def update(force: bool, yes: bool, url: str = None):
         driving update --force       # 强制重新安装
         driving update -y            # 跳过确认提示
     """
-    import os
     import shutil
     import stat
     import sys
@@ -234,55 +501,8 @@ def update(force: bool, yes: bool, url: str = None):
 
     # 下载并安装二进制文件
     try:
-        log_info(f"\n正在下载: {download_url}")
-
-        # 下载到系统临时目录
-        tmp_fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=tempfile.gettempdir())
-
-        try:
-            with urllib.request.urlopen(download_url, timeout=30) as response:
-                # 显示下载进度
-                total_size = int(response.headers.get("Content-Length", 0))
-                downloaded = 0
-                chunk_size = 8192
-
-                with os.fdopen(tmp_fd, "wb") as tmp_file:
-                    while True:
-                        chunk = response.read(chunk_size)
-                        if not chunk:
-                            break
-                        tmp_file.write(chunk)
-                        downloaded += len(chunk)
-
-                        if total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            # 使用 print 显示进度，覆盖同一行
-                            print(
-                                f"\r[INFO] 下载进度: {percent:.1f}% ({downloaded}/{total_size} bytes)",
-                                end="",
-                                flush=True,
-                            )
-
-                    # 确保所有数据都写入磁盘
-                    tmp_file.flush()
-                    os.fsync(tmp_file.fileno())
-
-            print()  # 换行
-            log_info("下载完成")
-
-        except Exception as e:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            log_error(f"下载失败: {str(e)}")
-            return
-
-        # 获取当前可执行文件路径
-        current_exe = None
-
-        # 首先尝试查找已安装的 driving 命令
-        result = subprocess.run(["which", "driving"], capture_output=True, text=True)
-        if result.returncode == 0:
-            current_exe = result.stdout.strip()
+        # 获取当前可执行文件路径：首先尝试在 PATH 中查找已安装的 driving 命令
+        current_exe = shutil.which("driving")
 
         # 如果没有找到，检查是否是直接运行的可执行文件
         if not current_exe:
@@ -294,53 +514,58 @@ def update(force: bool, yes: bool, url: str = None):
             log_info("请确保:")
             log_info("  1. 已通过 pip 安装: pip3 install -e .")
             log_info("  2. 或使用可执行文件: ./dist/driving update")
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
             return
 
         log_info(f"安装位置: {current_exe}")
+        log_info(f"\n正在下载: {download_url}")
+
+        # 下载到可执行文件所在目录：与目标位于同一文件系统，下载完成后直接原子重命名，
+        # 无需跨文件系统再复制一次
+        try:
+            tmp_fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(current_exe))
+        except PermissionError:
+            _log_permission_denied(yes)
+            return
 
-        # 验证下载的文件是否是有效的可执行文件
         try:
-            file_size = os.path.getsize(tmp_path)
-            if file_size < 1024:  # 小于 1KB 肯定不对
-                log_error(f"下载的文件太小 ({file_size} bytes)，可能下载不完整")
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                return
-            log_info(f"下载文件大小: {file_size / 1024 / 1024:.2f} MB")
+            # 关闭文件时缓冲区数据写入内核即可，无需 fsync：之后通过重命名替换可执行文件，
+            # 大文件 fsync 耗时较长，而更新中断时重新执行 driving update 即可
+            with os.fdopen(tmp_fd, "wb") as tmp_file:
+                _download_file(download_url, tmp_file)
+                file_size = os.fstat(tmp_file.fileno()).st_size
+
+                # 设置执行权限 (755: rwxr-xr-x)
+                os.fchmod(
+                    tmp_file.fileno(),
+                    stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH,
+                )
+
+            log_info("下载完成")
+
         except Exception as e:
-            log_error(f"无法验证下载文件: {str(e)}")
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+            log_error(f"下载失败: {str(e)}")
             return
 
+        # 验证下载的文件是否是有效的可执行文件
+        if file_size < 1024:  # 小于 1KB 肯定不对
+            log_error(f"下载的文件太小 ({file_size} bytes)，可能下载不完整")
+            os.unlink(tmp_path)
+            return
+        log_info(f"下载文件大小: {file_size / 1024 / 1024:.2f} MB")
+
         # 替换可执行文件
         try:
-            # 在 Unix 系统上，正在运行的可执行文件可以被删除和替换
-            # 使用 rename/move 而不是 copy，这样更安全和原子化
-
-            # 先删除旧文件（正在运行的进程仍然可以继续执行）
-            if os.path.exists(current_exe):
-                os.unlink(current_exe)
-
-            # 移动新文件到目标位置（比复制更原子化）
-            shutil.move(tmp_path, current_exe)
-
-            # 设置执行权限 (755: rwxr-xr-x)
-            os.chmod(
-                current_exe,
-                stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH,
-            )
+            # 同一文件系统内重命名，原子地覆盖旧文件（正在运行的进程仍然可以继续执行）
+            os.replace(tmp_path, current_exe)
 
             log_success(f"\n✓ 更新成功！当前版本: {latest_version}")
             log_info("\n提示: 更新将在下次运行 driving 命令时生效")
             log_info("请运行 'driving --version' 验证更新")
 
         except PermissionError:
-            log_error("权限不足，无法替换文件")
-            log_info("请尝试使用 sudo 运行:")
-            log_info(f"  sudo driving update {'-y' if yes else ''}")
+            _log_permission_denied(yes)
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
             return
@@ -1,12 +1,20 @@
 """框架信息数据模型"""
 
-import json
+import functools
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from driving.utils.json_helper import loads as json_loads
 
-@dataclass
+# Python 3.10+ 为数据类生成 __slots__：实例不再携带 __dict__，内存占用更小，属性访问更快
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# 框架信息只读，创建后不允许修改字段
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class Framework:
     """框架信息模型"""
 
@@ -43,6 +51,45 @@ class Framework:
         )
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_gitlist(gitlist_file: str, mtime_ns: int, size: int) -> Tuple[list, Dict[str, dict]]:
+    """读取并解析 gitlist.json（mtime_ns 和文件大小作为缓存键的一部分，文件变化后自动重新解析）
+
+    Args:
+        gitlist_file: gitlist.json 文件路径
+        mtime_ns: 文件修改时间（纳秒）
+        size: 文件大小
+
+    Returns:
+        Tuple: (框架配置列表, {框架名称: 框架配置}，同名框架以先出现的为准)
+    """
+    with open(gitlist_file, "rb") as f:
+        frameworks = json_loads(f.read())
+
+    by_name = {}
+    for fw in frameworks:
+        by_name.setdefault(fw.get("name"), fw)
+    return frameworks, by_name
+
+
+def _load_gitlist(gitlist_file: Path) -> Optional[Tuple[list, Dict[str, dict]]]:
+    """读取 gitlist.json，同一进程内文件未变化时直接返回缓存结果
+
+    返回的框架配置为缓存对象，调用方不应修改。
+
+    Args:
+        gitlist_file: gitlist.json 文件路径
+
+    Returns:
+        Optional[Tuple]: (框架配置列表, {框架名称: 框架配置})，文件不存在则返回 None
+    """
+    try:
+        st = os.stat(gitlist_file)
+    except OSError:
+        return None
+    return _parse_gitlist(os.fspath(gitlist_file), st.st_mtime_ns, st.st_size)
+
+
 def get_framework_by_name(gitlist_file: Path, name: str) -> Optional[dict]:
     """根据框架名称获取框架信息
 
@@ -53,16 +100,10 @@ def get_framework_by_name(gitlist_file: Path, name: str) -> Optional[dict]:
     Returns:
         Optional[dict]: 框架信息字典，不存在则返回 None
     """
-    if not gitlist_file.exists():
+    gitlist = _load_gitlist(gitlist_file)
+    if gitlist is None:
         return None
-
-    with open(gitlist_file, "r", encoding="utf-8") as f:
-        frameworks = json.load(f)
-
-    for fw in frameworks:
-        if fw.get("name") == name:
-            return fw
-    return None
+    return gitlist[1].get(name)
 
 
 def get_all_frameworks(gitlist_file: Path) -> List[Framework]:
@@ -74,10 +115,7 @@ def get_all_frameworks(gitlist_file: Path) -> List[Framework]:
     Returns:
         List[Framework]: 框架列表
     """
-    if not gitlist_file.exists():
+    gitlist = _load_gitlist(gitlist_file)
+    if gitlist is None:
         return []
-
-    with open(gitlist_file, "r", encoding="utf-8") as f:
-        frameworks = json.load(f)
-
-    return [Framework.from_dict(fw) for fw in frameworks]
+    return [Framework.from_dict(fw) for fw in gitlist[0]]
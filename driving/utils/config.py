@@ -1,9 +1,13 @@
 """配置模块 - 定义全局常量和配置"""
 
+import functools
 import os
+import re
+import stat
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-import git
 from dotenv import load_dotenv
 
 # 加载 .env 文件（从当前目录或父目录查找）
@@ -21,26 +25,31 @@ def update_env_file(project_root: Path, key: str, value: str):
     from driving.utils.logger import log_info, log_warning
 
     env_file = project_root / ".env"
-    existing_env = {}
-
-    # 读取现有的 .env 文件
-    if env_file.exists():
-        with open(env_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    existing_env[k.strip()] = v.strip()
-
-    # 更新或添加新的环境变量
-    existing_env[key] = value
-
-    # 写入 .env 文件
-    with open(env_file, "w", encoding="utf-8") as f:
-        f.write("# Driving CLI 配置\n")
-        f.write("# 此文件包含项目配置，可以提交到 Git 仓库\n\n")
-        for k, v in sorted(existing_env.items()):
-            f.write(f"{k}={v}\n")
+    new_line = f"{key}={value}"
+
+    try:
+        lines = env_file.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        lines = ["# Driving CLI 配置", "# 此文件包含项目配置，可以提交到 Git 仓库", ""]
+
+    # 逐行替换已有的同名变量（重复定义只保留第一处），其余行（包括注释）保持原样和原有顺序
+    found = False
+    updated_lines = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#") and stripped.split("=", 1)[0].strip() == key:
+            if found:
+                continue
+            found = True
+            line = new_line
+        updated_lines.append(line)
+    if not found:
+        updated_lines.append(new_line)
+
+    # 先写入临时文件再替换，写入中断时不会留下不完整的 .env 文件
+    tmp_file = env_file.with_name(".env.tmp")
+    tmp_file.write_text("\n".join(updated_lines) + "\n", encoding="utf-8")
+    os.replace(tmp_file, env_file)
 
     # 确保 .env 不在 .gitignore 中（因为这是项目配置，不是敏感信息）
     gitignore_file = project_root / ".gitignore"
@@ -92,73 +101,214 @@ _DEFAULT_SENSITIVE_KEYWORDS = [
     "privatekey",
 ]
 
-# 从环境变量读取敏感关键词（逗号分隔）
-_env_keywords = os.getenv("DRIVING_SENSITIVE_KEYWORDS", "")
-if _env_keywords:
-    SENSITIVE_KEYWORDS = [k.strip() for k in _env_keywords.split(",") if k.strip()]
-else:
-    SENSITIVE_KEYWORDS = _DEFAULT_SENSITIVE_KEYWORDS
+
+def _load_sensitive_keywords() -> list[str]:
+    """从环境变量 DRIVING_SENSITIVE_KEYWORDS（逗号分隔）读取敏感关键词，未设置时使用默认值
+
+    Returns:
+        list[str]: 敏感关键词列表
+    """
+    env_keywords = os.getenv("DRIVING_SENSITIVE_KEYWORDS", "")
+    if env_keywords:
+        return [k.strip() for k in env_keywords.split(",") if k.strip()]
+    return _DEFAULT_SENSITIVE_KEYWORDS
+
+
+def _compile_sensitive_keywords(keywords: list[str]) -> re.Pattern:
+    """将敏感关键词编译为忽略大小写的子串匹配正则
+
+    关键词为空时返回 (?!)，不匹配任何内容。
+
+    Args:
+        keywords: 敏感关键词列表
+
+    Returns:
+        re.Pattern: 编译后的正则
+    """
+    return re.compile("|".join(map(re.escape, keywords)) or "(?!)", re.IGNORECASE)
+
+
+SENSITIVE_KEYWORDS = _load_sensitive_keywords()
+
+# 敏感关键词集合（用于精确匹配，小写）和正则（用于子串匹配），导入时构建一次
+SENSITIVE_KEYWORDS_SET = frozenset(k.lower() for k in SENSITIVE_KEYWORDS)
+SENSITIVE_KEYWORDS_RE = _compile_sensitive_keywords(SENSITIVE_KEYWORDS)
 
 # ==================== 内部函数 ====================
 
+# 按工作目录缓存的函数列表（用于统一清除缓存）
+_CACHED_FUNCTIONS = []
 
-def _find_project_root() -> Path:
-    """查找项目根目录
 
-    从当前目录向上查找，直到找到包含 .driving 目录或 gitlist.json 文件的目录。
-    如果都找不到，返回当前目录。
+def _cache_per_cwd(func):
+    """按起始目录缓存函数的结果
+
+    被装饰的函数接收起始目录（绝对路径字符串），包装后的函数接收可选的 cwd 参数，
+    未传入时使用当前工作目录。一次 CLI 调用即一个进程，同一目录下的项目结构视为不变，
+    因此同一进程内的调用方看到的是首次调用时的结果。如需重新检测，调用 clear_cache()。
+    """
+    cached = functools.lru_cache(maxsize=None)(func)
+
+    @functools.wraps(func)
+    def wrapper(cwd: Optional[Path] = None):
+        return cached(os.path.abspath(cwd) if cwd is not None else os.getcwd())
+
+    wrapper.cache_clear = cached.cache_clear
+    _CACHED_FUNCTIONS.append(wrapper)
+    return wrapper
+
+
+def clear_cache():
+    """清除项目路径检测结果的缓存"""
+    for func in _CACHED_FUNCTIONS:
+        func.cache_clear()
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """获取文件状态（跟随符号链接），路径不存在或无法访问时返回 None
+
+    Args:
+        path: 文件路径
 
     Returns:
-        Path: 项目根目录
+        Optional[os.stat_result]: 文件状态
     """
-    current = Path.cwd()
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True)
+class _ProjectLayout:
+    """项目目录结构"""
 
-    # 向上查找，直到找到 .driving 或 gitlist.json
-    while current != current.parent:
-        if (current / ".driving").exists() or (current / "gitlist.json").exists():
-            return current
-        current = current.parent
+    root: Path  # 项目根目录
+    has_driving: bool  # 项目根目录是否存在 .driving
+    is_local: bool  # 是否为本地模式（项目根目录存在 gitlist.json）
+    driving_dir: Path  # 本地模式为项目根目录，标准模式为 .driving 目录
+    gitlist_file: Path  # driving 目录下的 gitlist.json
+    framework_base_dir: Path  # 框架仓库存储目录（driving 目录下的 submodules）
 
-    # 检查根目录
-    if (current / ".driving").exists() or (current / "gitlist.json").exists():
-        return current
 
-    # 都找不到，返回当前工作目录
-    return Path.cwd()
+@_cache_per_cwd
+def _get_layout(cwd: str) -> _ProjectLayout:
+    """查找项目根目录并计算项目目录结构
 
+    从起始目录向上查找，直到找到包含 .driving 目录或 gitlist.json 文件的目录，
+    如果都找不到，以起始目录作为项目根目录。同一起始目录只查找一次，各路径获取函数共用该结果。
 
-def is_local_mode() -> bool:
+    Args:
+        cwd: 起始目录（绝对路径）
+
+    Returns:
+        _ProjectLayout: 项目目录结构
+    """
+    current = cwd
+
+    # 向上查找，直到找到 .driving 或 gitlist.json（包括根目录）
+    while True:
+        # 每个候选只 stat 一次，同时判断是否存在及文件类型
+        driving_st = _stat_or_none(os.path.join(current, ".driving"))
+        gitlist_st = _stat_or_none(os.path.join(current, "gitlist.json"))
+        has_driving = driving_st is not None and stat.S_ISDIR(driving_st.st_mode)
+        has_gitlist = gitlist_st is not None and stat.S_ISREG(gitlist_st.st_mode)
+        if has_driving or has_gitlist:
+            root = Path(current)
+            break
+
+        parent = os.path.dirname(current)
+        if parent == current:
+            # 都找不到，使用起始目录
+            root = Path(cwd)
+            break
+        current = parent
+
+    driving_dir = root if has_gitlist else root / ".driving"
+    return _ProjectLayout(
+        root=root,
+        has_driving=has_driving,
+        is_local=has_gitlist,
+        driving_dir=driving_dir,
+        gitlist_file=driving_dir / "gitlist.json",
+        framework_base_dir=driving_dir / "submodules",
+    )
+
+
+def _find_project_root(cwd: Optional[Path] = None) -> Path:
+    """查找项目根目录
+
+    从起始目录向上查找，直到找到包含 .driving 目录或 gitlist.json 文件的目录。
+    如果都找不到，返回起始目录。
+
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
+    Returns:
+        Path: 项目根目录
+    """
+    return _get_layout(cwd).root
+
+
+def is_local_mode(cwd: Optional[Path] = None) -> bool:
     """判断是否为本地模式（项目根目录存在 gitlist.json）
 
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         bool: True 表示本地模式，False 表示标准模式（使用 .driving 目录）
     """
-    project_root = _find_project_root()
-    return (project_root / "gitlist.json").exists()
+    return _get_layout(cwd).is_local
 
 
-def get_driving_dir() -> Path:
+def get_driving_dir(cwd: Optional[Path] = None) -> Path:
     """获取 driving 目录路径
 
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         Path: 本地模式返回项目根目录，标准模式返回 .driving 目录
     """
-    project_root = _find_project_root()
-    if is_local_mode():
-        return project_root
-    return project_root / ".driving"
+    return _get_layout(cwd).driving_dir
 
 
-def get_gitlist_file() -> Path:
+def get_gitlist_file(cwd: Optional[Path] = None) -> Path:
     """获取 gitlist.json 文件路径
 
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         Path: gitlist.json 文件的完整路径
     """
-    return get_driving_dir() / "gitlist.json"
+    return _get_layout(cwd).gitlist_file
 
 
-def get_all_gitlist_files() -> list[Path]:
+@_cache_per_cwd
+def _find_gitlist_files(cwd: str) -> tuple[Path, ...]:
+    """查找 driving 目录下存在的 gitlist.json 文件（同一起始目录只查找一次）
+
+    Args:
+        cwd: 起始目录（绝对路径）
+
+    Returns:
+        tuple[Path, ...]: 按优先级排列的 gitlist.json 文件路径
+    """
+    driving_dir = _get_layout(cwd).driving_dir
+    candidates = (
+        # 1. ai-docs-local/gitlist.json（本地项目配置，优先级最高）
+        driving_dir / "ai-docs-local" / "gitlist.json",
+        # 2. ai-docs/gitlist.json（基础框架配置）
+        driving_dir / "ai-docs" / "gitlist.json",
+        # 3. gitlist.json（根目录配置，兼容旧版本）
+        driving_dir / "gitlist.json",
+    )
+    return tuple(path for path in candidates if path.exists())
+
+
+def get_all_gitlist_files(cwd: Optional[Path] = None) -> list[Path]:
     """获取所有 gitlist.json 文件路径列表
 
     按优先级顺序返回：
@@ -166,59 +316,47 @@ def get_all_gitlist_files() -> list[Path]:
     2. ai-docs/gitlist.json（基础框架配置）
     3. gitlist.json（根目录配置，兼容旧版本）
 
+    同一起始目录下的查找结果会被缓存，可通过 clear_cache() 清除。
+
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         list[Path]: gitlist.json 文件路径列表（只返回存在的文件）
     """
-    driving_dir = get_driving_dir()
-    gitlist_files = []
+    return list(_find_gitlist_files(cwd))
 
-    # 1. ai-docs-local/gitlist.json（本地项目配置，优先级最高）
-    local_gitlist = driving_dir / "ai-docs-local" / "gitlist.json"
-    if local_gitlist.exists():
-        gitlist_files.append(local_gitlist)
 
-    # 2. ai-docs/gitlist.json（基础框架配置）
-    ai_docs_gitlist = driving_dir / "ai-docs" / "gitlist.json"
-    if ai_docs_gitlist.exists():
-        gitlist_files.append(ai_docs_gitlist)
-
-    # 3. gitlist.json（根目录配置，兼容旧版本）
-    root_gitlist = driving_dir / "gitlist.json"
-    if root_gitlist.exists():
-        gitlist_files.append(root_gitlist)
-
-    return gitlist_files
-
-
-def get_framework_base_dir() -> Path:
+def get_framework_base_dir(cwd: Optional[Path] = None) -> Path:
     """获取框架仓库存储目录
 
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         Path: 本地模式返回 submodules 目录，标准模式返回 .driving/submodules 目录
     """
-    project_root = _find_project_root()
-    if is_local_mode():
-        return project_root / "submodules"
-    return project_root / ".driving" / "submodules"
+    return _get_layout(cwd).framework_base_dir
 
 
-def check_environment() -> tuple[bool, str]:
+def check_environment(cwd: Optional[Path] = None) -> tuple[bool, str]:
     """检查运行环境是否正确配置
 
     检查项目根目录是否存在 .driving 目录或 gitlist.json 文件。
     如果都不存在，说明环境未配置。
 
+    Args:
+        cwd: 起始目录，默认为当前工作目录
+
     Returns:
         tuple[bool, str]: (是否配置正确, 错误信息)
     """
-    project_root = _find_project_root()
-    has_driving = (project_root / ".driving").exists()
-    has_gitlist = (project_root / "gitlist.json").exists()
+    layout = _get_layout(cwd)
 
-    if not has_driving and not has_gitlist:
+    if not layout.has_driving and not layout.is_local:
         error_msg = (
             "项目根目录未配置 driving 环境。\n"
-            f"项目根目录: {project_root}\n"
+            f"项目根目录: {layout.root}\n"
             "请执行以下操作之一：\n"
             "  1. 执行 'driving install' 安装 .driving submodule\n"
             "  2. 切换到项目根目录（包含 .driving 或 gitlist.json 的目录）"
@@ -228,11 +366,12 @@ def check_environment() -> tuple[bool, str]:
     return True, ""
 
 
-# 兼容性：保留旧的常量名称
-DRIVING_DIR = get_driving_dir()
-GITLIST_FILE = get_gitlist_file()
-FRAMEWORK_BASE_DIR = get_framework_base_dir()
+# 兼容性：保留旧的常量名称（共用同一次项目根目录查找的结果）
+_layout = _get_layout()
+DRIVING_DIR = _layout.driving_dir
+GITLIST_FILE = _layout.gitlist_file
+FRAMEWORK_BASE_DIR = _layout.framework_base_dir
 
-# 确保框架目录存在（如果 driving 目录存在的话）
-if get_driving_dir().exists():
-    get_framework_base_dir().mkdir(parents=True, exist_ok=True)
+# 确保框架目录存在（如果 driving 目录存在的话，查找项目根目录时已经检查过）
+if _layout.is_local or _layout.has_driving:
+    FRAMEWORK_BASE_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,14 +1,21 @@
-"""Git 辅助模块 - 使用 GitPython 封装 Git 操作"""
+"""Git 辅助模块 - 使用 GitPython 及 git 命令行封装 Git 操作"""
 
+import functools
+import subprocess
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Optional, Union
 
-import git
+# GitPython 导入开销较大，仅在实际执行 Git 操作的函数内导入
+if TYPE_CHECKING:
+    import git
 
 
-def clone_repository(url: str, target_path: Union[str, Path], branch: str = None) -> git.Repo:
+def clone_repository(url: str, target_path: Union[str, Path], branch: str = None) -> "git.Repo":
     """克隆 Git 仓库
 
+    使用 partial clone（--filter=blob:none）：提交历史和分支完整保留，文件内容按需下载，
+    减少首次克隆的数据量。不支持该特性的服务端会忽略此参数，退化为普通克隆。
+
     Args:
         url: 仓库 URL
         target_path: 目标路径
@@ -20,15 +27,73 @@ def clone_repository(url: str, target_path: Union[str, Path], branch: str = None
     Raises:
         git.exc.GitCommandError: Git 命令执行失败
     """
+    import git
+
     try:
         if branch:
-            return git.Repo.clone_from(url, target_path, branch=branch)
+            return git.Repo.clone_from(url, target_path, branch=branch, filter="blob:none")
         else:
-            return git.Repo.clone_from(url, target_path)
+            return git.Repo.clone_from(url, target_path, filter="blob:none")
     except git.exc.GitCommandError as e:
         raise git.exc.GitCommandError(f"克隆仓库失败: {e}", 1)
 
 
+def get_remote_head(repo: "git.Repo", branch: str, remote: str = "origin") -> Optional[str]:
+    """通过 git ls-remote 获取远程分支最新提交的 SHA
+
+    Args:
+        repo: 仓库对象
+        branch: 分支名
+        remote: 远程仓库名，默认为 origin
+
+    Returns:
+        Optional[str]: 远程分支最新提交的 SHA，查询失败或分支不存在时返回 None
+    """
+    import git
+
+    try:
+        output = repo.git.ls_remote("--exit-code", remote, f"refs/heads/{branch}")
+    except git.exc.GitCommandError:
+        return None
+    return output.split()[0] if output else None
+
+
+def run_git(repo_dir: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """在指定目录中执行 git 命令
+
+    Args:
+        repo_dir: 仓库目录
+        *args: git 子命令及参数
+        check: 命令失败时是否抛出异常
+
+    Returns:
+        subprocess.CompletedProcess: 执行结果（stdout/stderr 为文本）
+
+    Raises:
+        subprocess.CalledProcessError: check 为 True 且命令返回非零退出码
+    """
+    return subprocess.run(
+        ["git", "-C", str(repo_dir), *args],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        check=check,
+    )
+
+
+def git_error_message(e: subprocess.CalledProcessError) -> str:
+    """提取 git 命令的错误信息，优先使用 stderr
+
+    Args:
+        e: git 命令执行失败的异常
+
+    Returns:
+        str: 错误信息
+    """
+    return (e.stderr or "").strip() or str(e)
+
+
 def is_git_repo(path: Union[str, Path]) -> bool:
     """检查路径是否是 Git 仓库
 
@@ -38,6 +103,8 @@ def is_git_repo(path: Union[str, Path]) -> bool:
     Returns:
         bool: 是否是 Git 仓库
     """
+    import git
+
     try:
         git.Repo(path)
         return True
@@ -45,10 +112,23 @@ def is_git_repo(path: Union[str, Path]) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=8)
+def _find_git_root_cached(path: Path) -> Path:
+    """查找 Git 仓库根目录（按起始路径缓存，未找到时抛出的异常不会被缓存）"""
+    import git
+
+    try:
+        repo = git.Repo(path, search_parent_directories=True)
+        return Path(repo.working_dir)
+    except git.exc.InvalidGitRepositoryError:
+        raise git.exc.InvalidGitRepositoryError(f"未找到 Git 仓库: {path}")
+
+
 def find_git_root(path: Union[str, Path] = None) -> Path:
     """查找 Git 仓库根目录
 
     从指定路径（默认为当前目录）向上查找，直到找到 Git 仓库根目录。
+    同一进程内相同起始路径的查找结果会被缓存，可通过 find_git_root.cache_clear() 清除。
 
     Args:
         path: 起始路径，默认为当前目录
@@ -64,11 +144,10 @@ def find_git_root(path: Union[str, Path] = None) -> Path:
     else:
         path = Path(path)
 
-    try:
-        repo = git.Repo(path, search_parent_directories=True)
-        return Path(repo.working_dir)
-    except git.exc.InvalidGitRepositoryError:
-        raise git.exc.InvalidGitRepositoryError(f"未找到 Git 仓库: {path}")
+    return _find_git_root_cached(path)
+
+
+find_git_root.cache_clear = _find_git_root_cached.cache_clear
 
 
 def is_local_framework(framework: dict) -> bool:
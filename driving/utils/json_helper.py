@@ -0,0 +1,60 @@
+"""JSON 辅助模块 - 优先使用 orjson，未安装时降级到标准库 json"""
+
+import json
+from typing import Any, Union
+
+# 尝试导入 orjson，如果失败则使用标准库 json
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种实现统一捕获该异常即可
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析 JSON 数据
+
+    Args:
+        data: JSON 内容（bytes 或 str）
+
+    Returns:
+        Any: 解析后的数据
+
+    Raises:
+        JSONDecodeError: JSON 格式错误
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON（2 空格缩进，保留非 ASCII 字符）
+
+    Args:
+        data: 待序列化的数据
+
+    Returns:
+        bytes: JSON 内容
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps(data: Any) -> str:
+    """序列化为 JSON 字符串（2 空格缩进，保留非 ASCII 字符）
+
+    Args:
+        data: 待序列化的数据
+
+    Returns:
+        str: JSON 字符串
+    """
+    if HAS_ORJSON:
+        return dumps_bytes(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=2)
@@ -1,11 +1,49 @@
 """日志模块 - 使用 Rich 实现彩色日志输出"""
 
-import sys
+import functools
+from typing import TYPE_CHECKING
 
-from rich.console import Console
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
-error_console = Console(stderr=True)
+
+@functools.lru_cache(maxsize=None)
+def get_console(stderr: bool = False) -> "Console":
+    """获取 Rich 控制台（首次输出时才导入 Rich 并创建，不输出日志的命令无需加载 Rich）
+
+    Args:
+        stderr: 是否输出到标准错误
+
+    Returns:
+        Console: 控制台对象
+    """
+    from rich.console import Console
+
+    return Console(stderr=stderr)
+
+
+def format_info(message: str) -> str:
+    """格式化信息日志行（蓝色）
+
+    Args:
+        message: 日志信息
+
+    Returns:
+        str: 带 Rich 样式标记的日志行
+    """
+    return f"[blue][INFO][/blue] {message}"
+
+
+def format_success(message: str) -> str:
+    """格式化成功日志行（绿色）
+
+    Args:
+        message: 日志信息
+
+    Returns:
+        str: 带 Rich 样式标记的日志行
+    """
+    return f"[green][SUCCESS][/green] {message}"
 
 
 def log_info(message: str):
@@ -14,7 +52,7 @@ def log_info(message: str):
     Args:
         message: 日志信息
     """
-    console.print(f"[blue][INFO][/blue] {message}")
+    get_console().print(format_info(message))
 
 
 def log_success(message: str):
@@ -23,7 +61,7 @@ def log_success(message: str):
     Args:
         message: 日志信息
     """
-    console.print(f"[green][SUCCESS][/green] {message}")
+    get_console().print(format_success(message))
 
 
 def log_error(message: str):
@@ -32,7 +70,7 @@ def log_error(message: str):
     Args:
         message: 日志信息
     """
-    error_console.print(f"[red][ERROR][/red] {message}")
+    get_console(stderr=True).print(f"[red][ERROR][/red] {message}")
 
 
 def log_warning(message: str):
@@ -41,4 +79,13 @@ def log_warning(message: str):
     Args:
         message: 日志信息
     """
-    console.print(f"[yellow][WARNING][/yellow] {message}")
+    get_console().print(f"[yellow][WARNING][/yellow] {message}")
+
+
+def log_lines(lines: list[str]):
+    """一次性输出多行已格式化的日志（由 format_info / format_success 生成）
+
+    Args:
+        lines: 日志行列表
+    """
+    get_console().print("\n".join(lines))
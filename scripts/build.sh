@@ -193,11 +193,13 @@ fi
 print_step "4. 构建可执行文件..."
 print_info "这可能需要几分钟时间..."
 
+# 子命令模块由 cli.py 按需动态导入，需要显式收集
 python3 -m PyInstaller \
     --name driving \
     --onefile \
     --console \
     --clean \
+    --collect-submodules driving.commands \
     --distpath ${DIST_DIR} \
     driving/cli.py
 
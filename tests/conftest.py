@@ -1,9 +1,54 @@
-"""Pytest 配置和共享 fixtures"""
+"""Pytest 配置和共享 fixtures
 
+不访问文件系统的测试不要请求 tmp_path（及依赖它的 fixture），每次请求都会创建并清理一个临时目录；
+只读的目录结构优先用 tmp_path_factory 在 module/session 级别创建一次后共享。
+"""
+
+import os
 from pathlib import Path
 
 import pytest
 
+from driving.utils import config
+from driving.utils.git_helper import find_git_root
+
+# 空 gitlist.json 内容（测试只关心文件是否存在）
+_EMPTY_GITLIST = b"{}"
+
+
+def _make_gitlist(path: Path) -> Path:
+    """在指定路径写入空的 gitlist.json（按需创建父目录）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_EMPTY_GITLIST)
+    return path
+
+
+def _make_tree(root: Path, paths: list) -> list:
+    """在 root 下批量创建目录（相对路径），已被更深路径包含的父目录不再单独创建
+
+    Returns:
+        list: 与 paths 顺序一致的目录路径列表
+    """
+    dirs = [root / p for p in paths]
+    created = set()
+    # 从最深的路径开始创建，os.makedirs 会一并创建其父目录
+    for d in sorted(dirs, key=lambda d: len(d.parts), reverse=True):
+        if d not in created:
+            os.makedirs(d, exist_ok=True)
+            created.add(d)
+            created.update(d.parents)
+    return dirs
+
+
+@pytest.fixture(autouse=True)
+def _clear_config_cache():
+    """每个测试前后清除项目路径检测缓存，避免测试之间互相影响"""
+    config.clear_cache()
+    find_git_root.cache_clear()
+    yield
+    config.clear_cache()
+    find_git_root.cache_clear()
+
 
 @pytest.fixture
 def sample_gitlist_data():
@@ -58,6 +103,50 @@ def mock_git_repo(tmp_path):
     return tmp_path
 
 
+@pytest.fixture
+def git_repo(tmp_path):
+    """最小的 Git 仓库结构（不执行 git init）
+
+    GitPython 识别仓库只检查 .git 下的 HEAD 文件以及 objects、refs 目录，
+    只创建这三项即可满足 find_git_root 的查找。
+    """
+    _make_tree(tmp_path, [".git/objects", ".git/refs"])
+    (tmp_path / ".git" / "HEAD").write_bytes(b"ref: refs/heads/main\n")
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def make_gitlist():
+    """返回创建空 gitlist.json 的辅助函数"""
+    return _make_gitlist
+
+
+@pytest.fixture(scope="session")
+def make_tree():
+    """返回批量创建目录的辅助函数"""
+    return _make_tree
+
+
+@pytest.fixture
+def local_mode_env(tmp_path):
+    """本地模式项目（根目录存在 gitlist.json）"""
+    _make_gitlist(tmp_path / "gitlist.json")
+    return tmp_path
+
+
+@pytest.fixture
+def standard_mode_env(tmp_path):
+    """标准模式项目（存在 .driving 目录）"""
+    (tmp_path / ".driving").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def mode_env(request):
+    """按参数（"local" / "standard"）返回对应模式的项目目录，配合 indirect 参数化使用"""
+    return request.getfixturevalue(f"{request.param}_mode_env")
+
+
 @pytest.fixture
 def mock_driving_project(tmp_path):
     """创建模拟的 driving 项目结构"""
@@ -7,177 +7,194 @@ import pytest
 
 from driving.utils.config import (
     SENSITIVE_KEYWORDS,
+    SENSITIVE_KEYWORDS_RE,
+    SENSITIVE_KEYWORDS_SET,
+    _compile_sensitive_keywords,
+    _load_sensitive_keywords,
     check_environment,
+    clear_cache,
     get_all_gitlist_files,
     get_driving_dir,
     get_framework_base_dir,
     get_gitlist_file,
     is_local_mode,
+    update_env_file,
 )
 
+# 文件系统相关测试分配到同一个 xdist worker（pytest -n auto --dist loadgroup）
+pytestmark = pytest.mark.xdist_group("fs")
+
 
 class TestConfigMode:
     """配置模式检测测试"""
 
-    def test_is_local_mode_with_gitlist(self, tmp_path, monkeypatch):
-        """测试本地模式检测 - 存在 gitlist.json"""
-        # 创建 gitlist.json
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
-
-        # 切换到测试目录
-        monkeypatch.chdir(tmp_path)
-
-        # 验证
-        assert is_local_mode() is True
+    @pytest.mark.parametrize(
+        "mode_env, expected", [("local", True), ("standard", False)], indirect=["mode_env"]
+    )
+    def test_is_local_mode(self, mode_env, expected):
+        """测试模式检测 - 存在 gitlist.json 为本地模式，存在 .driving 目录为标准模式"""
+        assert is_local_mode(cwd=mode_env) is expected
 
-    def test_is_local_mode_without_gitlist(self, tmp_path, monkeypatch):
+    def test_is_local_mode_without_gitlist(self, tmp_path):
         """测试本地模式检测 - 不存在 gitlist.json"""
-        monkeypatch.chdir(tmp_path)
-        assert is_local_mode() is False
-
-    def test_is_local_mode_with_driving_dir(self, tmp_path, monkeypatch):
-        """测试标准模式检测 - 存在 .driving 目录"""
-        # 创建 .driving 目录
-        driving_dir = tmp_path / ".driving"
-        driving_dir.mkdir()
-
-        monkeypatch.chdir(tmp_path)
-        assert is_local_mode() is False
+        assert is_local_mode(cwd=tmp_path) is False
 
 
 class TestPathResolution:
     """路径解析测试"""
 
-    def test_get_driving_dir_local_mode(self, tmp_path, monkeypatch):
-        """测试获取 driving 目录 - 本地模式"""
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
-
-        monkeypatch.chdir(tmp_path)
-
-        assert get_driving_dir() == tmp_path
+    @pytest.mark.parametrize(
+        "mode_env, subdir", [("local", "."), ("standard", ".driving")], indirect=["mode_env"]
+    )
+    def test_get_driving_dir(self, mode_env, subdir):
+        """测试获取 driving 目录"""
+        assert get_driving_dir(cwd=mode_env) == mode_env / subdir
 
-    def test_get_driving_dir_standard_mode(self, tmp_path, monkeypatch):
-        """测试获取 driving 目录 - 标准模式"""
-        driving_dir = tmp_path / ".driving"
-        driving_dir.mkdir()
-
-        monkeypatch.chdir(tmp_path)
-
-        assert get_driving_dir() == driving_dir
-
-    def test_get_gitlist_file_local_mode(self, tmp_path, monkeypatch):
+    def test_get_gitlist_file_local_mode(self, local_mode_env):
         """测试获取 gitlist.json 路径 - 本地模式"""
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
-
-        monkeypatch.chdir(tmp_path)
-
-        assert get_gitlist_file() == tmp_path / "gitlist.json"
+        assert get_gitlist_file(cwd=local_mode_env) == local_mode_env / "gitlist.json"
 
-    def test_get_framework_base_dir_local_mode(self, tmp_path, monkeypatch):
-        """测试获取框架目录 - 本地模式"""
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
+    @pytest.mark.parametrize(
+        "mode_env, subdir", [("local", "."), ("standard", ".driving")], indirect=["mode_env"]
+    )
+    def test_get_framework_base_dir(self, mode_env, subdir):
+        """测试获取框架目录"""
+        assert get_framework_base_dir(cwd=mode_env) == mode_env / subdir / "submodules"
 
-        monkeypatch.chdir(tmp_path)
-
-        assert get_framework_base_dir() == tmp_path / "submodules"
-
-    def test_get_framework_base_dir_standard_mode(self, tmp_path, monkeypatch):
-        """测试获取框架目录 - 标准模式"""
-        driving_dir = tmp_path / ".driving"
-        driving_dir.mkdir()
 
-        monkeypatch.chdir(tmp_path)
+@pytest.fixture(scope="module")
+def all_gitlist_tree(tmp_path_factory, make_gitlist):
+    """包含所有 gitlist.json（根目录、ai-docs、ai-docs-local）的项目，模块内只创建一次
 
-        assert get_framework_base_dir() == driving_dir / "submodules"
+    测试只读取该目录结构，不应修改其中的文件。
+    """
+    root = tmp_path_factory.mktemp("all_gitlist")
+    return {
+        "root": root,
+        "root_gitlist": make_gitlist(root / "gitlist.json"),
+        "ai-docs": make_gitlist(root / "ai-docs" / "gitlist.json"),
+        "ai-docs-local": make_gitlist(root / "ai-docs-local" / "gitlist.json"),
+    }
 
 
 class TestMultipleGitlistFiles:
     """多配置文件支持测试"""
 
-    def test_get_all_gitlist_files_empty(self, tmp_path, monkeypatch):
+    def test_get_all_gitlist_files_empty(self, tmp_path):
         """测试获取所有 gitlist.json - 无配置文件"""
-        monkeypatch.chdir(tmp_path)
-
         # 创建 .driving 目录但不创建配置文件
         driving_dir = tmp_path / ".driving"
         driving_dir.mkdir()
 
-        files = get_all_gitlist_files()
+        files = get_all_gitlist_files(cwd=tmp_path)
         assert len(files) == 0
 
-    def test_get_all_gitlist_files_root_only(self, tmp_path, monkeypatch):
+    def test_get_all_gitlist_files_root_only(self, tmp_path, make_gitlist):
         """测试获取所有 gitlist.json - 仅根目录配置"""
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
-
-        monkeypatch.chdir(tmp_path)
+        gitlist = make_gitlist(tmp_path / "gitlist.json")
 
-        files = get_all_gitlist_files()
+        files = get_all_gitlist_files(cwd=tmp_path)
         assert len(files) == 1
         assert files[0] == gitlist
 
-    def test_get_all_gitlist_files_all(self, tmp_path, monkeypatch):
+    def test_get_all_gitlist_files_all(self, all_gitlist_tree):
         """测试获取所有 gitlist.json - 所有配置文件"""
-        # 创建所有配置文件
-        gitlist_root = tmp_path / "gitlist.json"
-        gitlist_root.write_text("{}")
-
-        ai_docs = tmp_path / "ai-docs"
-        ai_docs.mkdir()
-        gitlist_ai_docs = ai_docs / "gitlist.json"
-        gitlist_ai_docs.write_text("{}")
-
-        ai_docs_local = tmp_path / "ai-docs-local"
-        ai_docs_local.mkdir()
-        gitlist_local = ai_docs_local / "gitlist.json"
-        gitlist_local.write_text("{}")
-
-        monkeypatch.chdir(tmp_path)
-
-        files = get_all_gitlist_files()
+        files = get_all_gitlist_files(cwd=all_gitlist_tree["root"])
         assert len(files) == 3
         # 验证顺序：local > ai-docs > root
-        assert files[0] == gitlist_local
-        assert files[1] == gitlist_ai_docs
-        assert files[2] == gitlist_root
+        assert files == [
+            all_gitlist_tree["ai-docs-local"],
+            all_gitlist_tree["ai-docs"],
+            all_gitlist_tree["root_gitlist"],
+        ]
 
 
 class TestEnvironmentCheck:
     """环境检查测试"""
 
-    def test_check_environment_with_driving(self, tmp_path, monkeypatch):
-        """测试环境检查 - 存在 .driving 目录"""
-        driving_dir = tmp_path / ".driving"
-        driving_dir.mkdir()
-
-        monkeypatch.chdir(tmp_path)
-
-        is_ok, error_msg = check_environment()
+    @pytest.mark.parametrize("mode_env", ["local", "standard"], indirect=True)
+    def test_check_environment_configured(self, mode_env):
+        """测试环境检查 - 存在 gitlist.json 或 .driving 目录"""
+        is_ok, error_msg = check_environment(cwd=mode_env)
         assert is_ok is True
         assert error_msg == ""
 
-    def test_check_environment_with_gitlist(self, tmp_path, monkeypatch):
-        """测试环境检查 - 存在 gitlist.json"""
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
+    def test_check_environment_without_config(self, tmp_path):
+        """测试环境检查 - 无配置"""
+        is_ok, error_msg = check_environment(cwd=tmp_path)
+        assert is_ok is False
+        assert "未配置 driving 环境" in error_msg
+
 
+class TestConfigCache:
+    """路径检测缓存测试"""
+
+    def test_cached_within_same_cwd(self, tmp_path, monkeypatch, make_gitlist):
+        """测试同一工作目录下返回缓存结果，清除缓存后重新检测"""
         monkeypatch.chdir(tmp_path)
+        assert is_local_mode() is False
 
-        is_ok, error_msg = check_environment()
-        assert is_ok is True
-        assert error_msg == ""
+        # 缓存期间不会感知到新创建的 gitlist.json
+        make_gitlist(tmp_path / "gitlist.json")
+        assert is_local_mode() is False
+
+        clear_cache()
+        assert is_local_mode() is True
+
+    def test_cache_keyed_by_cwd(self, tmp_path, monkeypatch, make_gitlist, make_tree):
+        """测试切换工作目录后重新检测"""
+        local_dir, standard_driving_dir = make_tree(tmp_path, ["local", "standard/.driving"])
+        make_gitlist(local_dir / "gitlist.json")
+
+        monkeypatch.chdir(local_dir)
+        assert get_driving_dir() == local_dir
+
+        monkeypatch.chdir(standard_driving_dir.parent)
+        assert get_driving_dir() == standard_driving_dir
+
+    def test_gitlist_files_cached_until_clear(self, tmp_path, make_gitlist):
+        """测试 gitlist.json 列表在清除缓存前保持不变"""
+        root_gitlist = make_gitlist(tmp_path / "gitlist.json")
+        assert get_all_gitlist_files(cwd=tmp_path) == [root_gitlist]
+
+        local_gitlist = make_gitlist(tmp_path / "ai-docs-local" / "gitlist.json")
+        assert get_all_gitlist_files(cwd=tmp_path) == [root_gitlist]
+
+        clear_cache()
+        assert get_all_gitlist_files(cwd=tmp_path) == [local_gitlist, root_gitlist]
+
+    def test_cwd_argument_matches_current_dir(self, tmp_path, monkeypatch, make_gitlist):
+        """测试传入 cwd 与切换到该目录的结果一致"""
+        make_gitlist(tmp_path / "gitlist.json")
+        assert get_driving_dir(cwd=tmp_path) == tmp_path
 
-    def test_check_environment_without_config(self, tmp_path, monkeypatch):
-        """测试环境检查 - 无配置"""
         monkeypatch.chdir(tmp_path)
+        assert get_driving_dir() == tmp_path
 
-        is_ok, error_msg = check_environment()
-        assert is_ok is False
-        assert "未配置 driving 环境" in error_msg
+
+class TestUpdateEnvFile:
+    """.env 文件更新测试"""
+
+    def test_create_env_file(self, tmp_path):
+        """测试创建 .env 文件"""
+        update_env_file(tmp_path, "DRIVING_REPO_URL", "https://example.com/driving")
+
+        content = (tmp_path / ".env").read_text(encoding="utf-8")
+        assert content.startswith("# Driving CLI 配置\n")
+        assert content.endswith("\nDRIVING_REPO_URL=https://example.com/driving\n")
+
+    def test_update_preserves_comments_and_order(self, tmp_path):
+        """测试更新已有变量时保留注释和原有顺序"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("# 自定义注释\nB=1\nA = old\n\n# 重复定义\nA=dup\n", encoding="utf-8")
+
+        update_env_file(tmp_path, "A", "new")
+        update_env_file(tmp_path, "C", "3")
+
+        assert env_file.read_text(encoding="utf-8") == (
+            "# 自定义注释\nB=1\nA=new\n\n# 重复定义\nC=3\n"
+        )
+        assert not (tmp_path / ".env.tmp").exists()
 
 
 class TestSensitiveKeywords:
@@ -190,52 +207,69 @@ class TestSensitiveKeywords:
         assert "api_key" in SENSITIVE_KEYWORDS
         assert "token" in SENSITIVE_KEYWORDS
         assert "secret" in SENSITIVE_KEYWORDS
+        assert "token" in SENSITIVE_KEYWORDS_SET
+        assert SENSITIVE_KEYWORDS_RE.search("GITHUB_Access_Token")
+        assert not SENSITIVE_KEYWORDS_RE.search("command")
 
     def test_custom_sensitive_keywords(self, monkeypatch):
         """测试自定义敏感关键词"""
-        # 设置环境变量
         monkeypatch.setenv("DRIVING_SENSITIVE_KEYWORDS", "custom_key,custom_token")
 
-        # 重新导入模块以应用环境变量
-        import importlib
+        keywords = _load_sensitive_keywords()
+        assert keywords == ["custom_key", "custom_token"]
 
-        from driving.utils import config
+        pattern = _compile_sensitive_keywords(keywords)
+        assert pattern.search("MY_CUSTOM_TOKEN")
+        assert not pattern.search("api_key")
 
-        importlib.reload(config)
+    def test_empty_sensitive_keywords(self, monkeypatch):
+        """测试敏感关键词为空时不匹配任何键名"""
+        monkeypatch.setenv("DRIVING_SENSITIVE_KEYWORDS", " , ")
 
-        assert "custom_key" in config.SENSITIVE_KEYWORDS
-        assert "custom_token" in config.SENSITIVE_KEYWORDS
+        keywords = _load_sensitive_keywords()
+        assert keywords == []
+        assert not _compile_sensitive_keywords(keywords).search("api_key")
 
 
 class TestSubdirectorySupport:
     """子目录支持测试"""
 
-    def test_find_project_root_from_subdirectory(self, tmp_path, monkeypatch):
+    def test_find_project_root_from_subdirectory(self, tmp_path, make_gitlist, make_tree):
         """测试从子目录查找项目根目录"""
         # 创建项目结构
-        gitlist = tmp_path / "gitlist.json"
-        gitlist.write_text("{}")
-
-        subdir = tmp_path / "src" / "module"
-        subdir.mkdir(parents=True)
+        make_gitlist(tmp_path / "gitlist.json")
+        (subdir,) = make_tree(tmp_path, ["src/module"])
 
-        # 切换到子目录
-        monkeypatch.chdir(subdir)
-
-        # 应该能找到父目录的配置
-        assert get_driving_dir() == tmp_path
+        # 从子目录开始查找，应该能找到父目录的配置
+        assert get_driving_dir(cwd=subdir) == tmp_path
 
-    def test_find_driving_dir_from_subdirectory(self, tmp_path, monkeypatch):
+    def test_find_driving_dir_from_subdirectory(self, tmp_path, make_tree):
         """测试从子目录查找 .driving 目录"""
         # 创建项目结构
-        driving_dir = tmp_path / ".driving"
-        driving_dir.mkdir()
+        driving_dir, subdir = make_tree(tmp_path, [".driving", "src/module"])
+
+        # 从子目录开始查找，应该能找到父目录的 .driving
+        assert get_driving_dir(cwd=subdir) == driving_dir
+
+    def test_layout_stats_each_candidate_once(self, tmp_path, monkeypatch, make_gitlist, make_tree):
+        """测试查找项目根目录时每个候选路径只调用一次 stat"""
+        (subdir,) = make_tree(tmp_path, ["a/b"])
+        make_gitlist(tmp_path / "gitlist.json")
+
+        calls = []
+        real_stat = os.stat
 
-        subdir = tmp_path / "src" / "module"
-        subdir.mkdir(parents=True)
+        def counting_stat(path, *args, **kwargs):
+            calls.append(os.fspath(path))
+            return real_stat(path, *args, **kwargs)
 
-        # 切换到子目录
-        monkeypatch.chdir(subdir)
+        with monkeypatch.context() as m:
+            m.setattr(os, "stat", counting_stat)
+            assert is_local_mode(cwd=subdir) is True
 
-        # 应该能找到父目录的 .driving
-        assert get_driving_dir() == driving_dir
+        expected = [
+            os.path.join(d, name)
+            for d in (subdir, subdir.parent, tmp_path)
+            for name in (".driving", "gitlist.json")
+        ]
+        assert calls == expected
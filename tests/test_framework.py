@@ -1,71 +1,96 @@
 """框架管理测试（修复版）"""
 
 import json
+import sys
 import pytest
+from dataclasses import FrozenInstanceError, asdict, replace
 from pathlib import Path
-from driving.models.framework import Framework
+from driving.models.framework import Framework, get_all_frameworks, get_framework_by_name
+
+
+# 各用例共用的框架字段，用例只覆盖与之不同的部分
+_BASE = {
+    "name": "test",
+    "project_name": "test",
+    "url": "https://github.com/test",
+    "module": "test",
+    "sources": [],
+    "description": "测试框架",
+    "creator": "测试者",
+    "date": "2024-01-20",
+}
+
+# from_dict 测试的期望结果
+_EXPECTED_XSTATIC = Framework(
+    name="xstatic",
+    project_name="xstatic",
+    url="https://github.com/example/xstatic",
+    branch="main",
+    module="library_xstatic",
+    sources=["src/main/java/hb/xstatic/*"],
+    description="测试框架",
+    creator="测试者",
+    date="2024-01-20",
+)
 
 
 class TestFrameworkModel:
     """框架模型测试"""
 
-    def test_framework_creation(self):
-        """测试创建框架对象"""
-        framework = Framework(
-            name="xstatic",
-            project_name="xstatic",
-            url="https://github.com/example/xstatic",
-            branch="main",
-            module="library_xstatic",
-            sources=["src/main/java/hb/xstatic/*"],
-            description="Activity/Fragment 基础封装框架",
-            creator="开发团队",
-            date="2024-01-20"
-        )
-        
-        assert framework.name == "xstatic"
-        assert framework.project_name == "xstatic"
-        assert framework.url == "https://github.com/example/xstatic"
-        assert framework.branch == "main"
-        assert framework.module == "library_xstatic"
-        assert len(framework.sources) == 1
-        assert framework.description == "Activity/Fragment 基础封装框架"
-        assert framework.creator == "开发团队"
-        assert framework.date == "2024-01-20"
-
-    def test_framework_without_branch(self):
-        """测试不带分支的框架"""
-        framework = Framework(
-            name="ximage",
-            project_name="ximage",
-            url="https://github.com/example/ximage",
-            module="library_ximage",
-            sources=["src/main/java/hb/ximage/*"],
-            description="图片加载框架",
-            creator="开发团队",
-            date="2024-01-21"
-        )
-        
-        assert framework.branch is None
-        assert framework.name == "ximage"
-
-    def test_framework_local_project(self):
-        """测试本地项目标识"""
-        framework = Framework(
-            name="driving",
-            project_name="__local__",
-            url="__local__",
-            branch="__local__",
-            module="driving",
-            sources=["cli-tool/driving/*"],
-            description="Driving CLI 工具",
-            creator="开发团队",
-            date="2024-01-25"
-        )
-        
-        assert framework.project_name == "__local__"
-        assert framework.url == "__local__"
-        assert framework.branch == "__local__"
+    @pytest.mark.parametrize(
+        "kwargs, expected_branch",
+        [
+            pytest.param(
+                {
+                    "name": "xstatic",
+                    "project_name": "xstatic",
+                    "url": "https://github.com/example/xstatic",
+                    "branch": "main",
+                    "module": "library_xstatic",
+                    "sources": ["src/main/java/hb/xstatic/*"],
+                    "description": "Activity/Fragment 基础封装框架",
+                    "creator": "开发团队",
+                },
+                "main",
+                id="creation",
+            ),
+            pytest.param(
+                {"name": "ximage", "project_name": "ximage", "module": "library_ximage"},
+                None,
+                id="without_branch",
+            ),
+            pytest.param(
+                {
+                    "name": "driving",
+                    "project_name": "__local__",
+                    "url": "__local__",
+                    "branch": "__local__",
+                },
+                "__local__",
+                id="local_project",
+            ),
+            pytest.param({"branch": "develop"}, "develop", id="all_fields"),
+            pytest.param({}, None, id="minimal_fields"),
+        ],
+    )
+    def test_framework(self, kwargs, expected_branch):
+        """测试创建框架对象：传入的字段原样保留，未传入 branch 时为 None"""
+        framework = Framework(**{**_BASE, **kwargs})
+
+        assert asdict(framework) == {"branch": None, **_BASE, **kwargs}
+        assert framework.branch == expected_branch
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots 需要 Python 3.10+")
+    def test_framework_uses_slots(self):
+        """测试框架对象使用 __slots__（不携带 __dict__）"""
+        assert hasattr(Framework, "__slots__")
+        assert not hasattr(Framework(**_BASE), "__dict__")
+
+    def test_framework_is_frozen(self):
+        """测试框架对象创建后不允许修改字段"""
+        framework = Framework(**_BASE)
+        with pytest.raises(FrozenInstanceError):
+            framework.name = "changed"
 
     def test_framework_from_dict(self):
         """测试从字典创建框架"""
@@ -81,17 +106,14 @@ class TestFrameworkModel:
             "date": "2024-01-20"
         }
         
-        framework = Framework.from_dict(data)
-        assert framework.name == "xstatic"
-        assert framework.branch == "main"
+        assert Framework.from_dict(data) == _EXPECTED_XSTATIC
 
 
 class TestFrameworkLoading:
     """框架加载测试"""
 
-    def test_load_framework_from_json(self, tmp_path):
-        """测试从 JSON 加载框架"""
-        # 创建测试配置文件
+    def test_load_framework_from_dict(self):
+        """测试从 gitlist 配置项加载框架"""
         gitlist_data = [
             {
                 "name": "xstatic",
@@ -106,18 +128,11 @@ class TestFrameworkLoading:
             }
         ]
         
-        gitlist_file = tmp_path / "gitlist.json"
-        gitlist_file.write_text(json.dumps(gitlist_data, ensure_ascii=False, indent=2))
-        
-        # 读取并验证
-        with open(gitlist_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        assert len(data) == 1
-        assert data[0]['name'] == "xstatic"
-        assert data[0]['description'] == "测试框架"
+        framework = Framework.from_dict(gitlist_data[0])
+
+        assert framework == replace(_EXPECTED_XSTATIC, creator="测试")
 
-    def test_load_multiple_frameworks(self, tmp_path):
+    def test_load_multiple_frameworks(self):
         """测试加载多个框架"""
         gitlist_data = [
             {
@@ -142,53 +157,22 @@ class TestFrameworkLoading:
             }
         ]
         
+        frameworks = [Framework.from_dict(data) for data in gitlist_data]
+
+        assert [fw.name for fw in frameworks] == ["xstatic", "ximage"]
+        assert all(fw.branch is None for fw in frameworks)
+
+    def test_get_framework_by_name_reloads_modified_file(self, tmp_path, sample_gitlist_data):
+        """测试 gitlist.json 修改后重新读取"""
         gitlist_file = tmp_path / "gitlist.json"
-        gitlist_file.write_text(json.dumps(gitlist_data, ensure_ascii=False, indent=2))
-        
-        # 读取并验证
-        with open(gitlist_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        assert len(data) == 2
-        assert data[0]['name'] == "xstatic"
-        assert data[1]['name'] == "ximage"
-
-
-class TestFrameworkValidation:
-    """框架配置验证测试"""
-
-    def test_framework_all_fields(self):
-        """测试所有字段"""
-        framework = Framework(
-            name="test",
-            project_name="test",
-            url="https://github.com/test",
-            module="test",
-            sources=[],
-            description="测试框架",
-            creator="测试者",
-            date="2024-01-20",
-            branch="develop"
-        )
-        
-        assert framework.name == "test"
-        assert framework.description == "测试框架"
-        assert framework.creator == "测试者"
-        assert framework.date == "2024-01-20"
-        assert framework.branch == "develop"
-
-    def test_framework_minimal_fields(self):
-        """测试最小字段集"""
-        framework = Framework(
-            name="test",
-            project_name="test",
-            url="https://github.com/test",
-            module="test",
-            sources=[],
-            description="测试",
-            creator="测试者",
-            date="2024-01-20"
-        )
-        
-        assert framework.name == "test"
-        assert framework.branch is None
+        gitlist_file.write_bytes(json.dumps(sample_gitlist_data).encode("ascii"))
+
+        assert get_framework_by_name(gitlist_file, "ximage")["branch"] == "develop"
+        assert get_framework_by_name(gitlist_file, "missing") is None
+        assert [fw.name for fw in get_all_frameworks(gitlist_file)] == ["xstatic", "ximage"]
+
+        gitlist_file.write_bytes(json.dumps(sample_gitlist_data[:1]).encode("ascii"))
+
+        assert get_framework_by_name(gitlist_file, "ximage") is None
+        assert [fw.name for fw in get_all_frameworks(gitlist_file)] == ["xstatic"]
+        assert get_framework_by_name(tmp_path / "missing.json", "xstatic") is None
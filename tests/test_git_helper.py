@@ -5,57 +5,44 @@ from pathlib import Path
 import git
 from driving.utils.git_helper import find_git_root
 
+# 文件系统相关测试分配到同一个 xdist worker（pytest -n auto --dist loadgroup）
+pytestmark = pytest.mark.xdist_group("fs")
+
 
 class TestFindGitRoot:
     """查找 Git 仓库根目录测试"""
 
-    def test_find_git_root_in_repo(self, tmp_path, monkeypatch):
-        """测试在 Git 仓库中查找根目录"""
-        # 初始化真实的 Git 仓库
-        repo = git.Repo.init(tmp_path)
-        
-        # 创建子目录
-        subdir = tmp_path / "src" / "module"
-        subdir.mkdir(parents=True)
-        
-        # 切换到子目录
-        monkeypatch.chdir(subdir)
-        
-        # 应该能找到 Git 根目录
-        root = find_git_root()
-        assert root == tmp_path
+    @pytest.mark.parametrize(
+        "sub",
+        ["", "src/module", "a/b/c/d"],
+        ids=["from_current_dir", "in_repo", "nested_structure"],
+    )
+    def test_find_git_root(self, git_repo, monkeypatch, make_tree, sub):
+        """测试从仓库根目录及不同深度的子目录查找根目录"""
+        (cwd,) = make_tree(git_repo, [sub])
+        monkeypatch.chdir(cwd)
+
+        assert find_git_root() == git_repo
 
     def test_find_git_root_not_in_repo(self, tmp_path, monkeypatch):
         """测试不在 Git 仓库中"""
+        real_repo = git.Repo
+
+        # GitPython 不支持 GIT_CEILING_DIRECTORIES，向上查找限制在 tmp_path 内，
+        # 避免遍历测试机的上级目录（上级目录恰好是 Git 仓库时测试也不会误判）
+        def bounded_repo(path, search_parent_directories=False, **kwargs):
+            path = Path(path)
+            candidates = [path, *path.parents] if search_parent_directories else [path]
+            for candidate in candidates:
+                if candidate != tmp_path and tmp_path not in candidate.parents:
+                    break
+                if (candidate / ".git").exists():
+                    return real_repo(candidate, **kwargs)
+            raise git.exc.InvalidGitRepositoryError(path)
+
+        monkeypatch.setattr(git, "Repo", bounded_repo)
         monkeypatch.chdir(tmp_path)
         
         # 应该抛出异常
         with pytest.raises(git.exc.InvalidGitRepositoryError):
             find_git_root()
-
-    def test_find_git_root_from_current_dir(self, tmp_path, monkeypatch):
-        """测试从当前目录查找"""
-        # 初始化真实的 Git 仓库
-        repo = git.Repo.init(tmp_path)
-        
-        monkeypatch.chdir(tmp_path)
-        
-        # 应该返回当前目录
-        root = find_git_root()
-        assert root == tmp_path
-
-    def test_find_git_root_nested_structure(self, tmp_path, monkeypatch):
-        """测试嵌套目录结构"""
-        # 初始化真实的 Git 仓库
-        repo = git.Repo.init(tmp_path)
-        
-        # 创建深层嵌套目录
-        deep_dir = tmp_path / "a" / "b" / "c" / "d"
-        deep_dir.mkdir(parents=True)
-        
-        # 切换到深层目录
-        monkeypatch.chdir(deep_dir)
-        
-        # 应该能找到根目录
-        root = find_git_root()
-        assert root == tmp_path
@@ -0,0 +1,38 @@
+"""JSON 辅助函数测试"""
+
+import json
+
+import pytest
+
+from driving.utils import json_helper
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """分别使用 orjson 和标准库 json 运行测试"""
+    if request.param and not json_helper.HAS_ORJSON:
+        pytest.skip("orjson 未安装")
+    monkeypatch.setattr(json_helper, "HAS_ORJSON", request.param)
+    return request.param
+
+
+class TestJsonHelper:
+    """JSON 读写测试"""
+
+    def test_loads_bytes_and_str(self, backend):
+        """测试解析 bytes 和 str"""
+        data = '[{"name": "xstatic", "description": "基础框架"}]'
+        assert json_helper.loads(data) == json_helper.loads(data.encode("utf-8"))
+        assert json_helper.loads(data)[0]["description"] == "基础框架"
+
+    def test_loads_invalid(self, backend):
+        """测试解析失败时抛出 json.JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            json_helper.loads(b"{invalid")
+
+    def test_dumps_matches_stdlib_format(self, backend):
+        """测试输出格式与 json.dumps(ensure_ascii=False, indent=2) 一致"""
+        data = {"name": "xstatic", "sources": ["src/*"], "description": "基础框架"}
+        expected = json.dumps(data, ensure_ascii=False, indent=2)
+        assert json_helper.dumps(data) == expected
+        assert json_helper.dumps_bytes(data) == expected.encode("utf-8")